@@ -0,0 +1,78 @@
+"""Measure CPU time and peak memory of parse_content for large inputs, compared with the baseline that
+read files whole and base64 decoded all bytes before encoding them again.
+
+    $ python benchmarks/parse_content.py [size in MB]
+"""
+import binascii
+import sys
+import tempfile
+import time
+import tracemalloc
+from base64 import b64decode, b64encode
+from os import urandom
+from pathlib import Path
+
+import filetype
+from las.client import Base64Content, RawContent, parse_content
+
+
+def baseline_parse_content(content, find_content_type=False, base_64_encode=True):
+    # RawContent and Base64Content did not exist, their bytes were passed as is
+    if isinstance(content, (RawContent, Base64Content)):
+        content = content.data
+    if isinstance(content, (str, Path)):
+        raw = Path(content).read_bytes()
+    else:
+        try:
+            raw = b64decode(content, validate=True)
+        except binascii.Error:
+            raw = content
+    content_type = filetype.guess(raw).mime if find_content_type else None
+    parsed_content = b64encode(raw).decode() if base_64_encode else raw
+    return parsed_content, content_type
+
+
+def measure(parse, content, **kwargs):
+    parse(content, **kwargs)
+    start = time.process_time()
+    for _ in range(5):
+        parse(content, **kwargs)
+    cpu = (time.process_time() - start) / 5
+
+    tracemalloc.start()
+    parse(content, **kwargs)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return cpu, peak
+
+
+def main(size_mb):
+    raw = b'\xFF\xD8\xFF\xEE' + urandom(size_mb * 2 ** 20)
+    encoded = b64encode(raw)
+    path = tempfile.NamedTemporaryFile(suffix='.jpeg')
+    path.write(raw)
+    path.flush()
+    cases = [
+        ('raw bytes, upload', raw, {'base_64_encode': False}),
+        ('raw bytes, base64', raw, {}),
+        ('raw bytes, content type', raw, {'find_content_type': True, 'base_64_encode': False}),
+        ('base64 bytes, upload', encoded, {'base_64_encode': False}),
+        ('base64 bytes, base64', encoded, {}),
+        ('base64 bytes, content type', encoded, {'find_content_type': True}),
+        ('RawContent, upload', RawContent(raw), {'base_64_encode': False}),
+        ('Base64Content, base64', Base64Content(encoded), {}),
+        ('file path, upload', path.name, {'base_64_encode': False}),
+        ('file path, base64', path.name, {}),
+    ]
+    print(f'{"":<30}{"baseline":>20}{"parse_content":>20}')
+    print(f'{"case":<30}{"cpu ms":>10}{"peak MB":>10}{"cpu ms":>10}{"peak MB":>10}')
+    for name, content, kwargs in cases:
+        row = f'{name:<30}'
+        for parse in (baseline_parse_content, parse_content):
+            cpu, peak = measure(parse, content, **kwargs)
+            row += f'{cpu * 1000:>10.1f}{peak / 2 ** 20:>10.1f}'
+        print(row)
+
+
+if __name__ == '__main__':
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 20)
@@ -0,0 +1,37 @@
+"""Measure the wall time to prepare documents for create_documents in the calling process and in a pool of worker
+processes, for raw and for base64 encoded content.
+
+    $ python benchmarks/prepare_documents.py [number of documents] [size in MB] [number of processes]
+"""
+import sys
+import time
+from base64 import b64encode
+from concurrent.futures import ProcessPoolExecutor
+from os import urandom
+
+from las.client import _prepare_document
+
+
+def measure(prepare, documents):
+    start = time.perf_counter()
+    list(prepare(_prepare_document, documents))
+    return time.perf_counter() - start
+
+
+def main(count, size_mb, processes):
+    raw = b'\xFF\xD8\xFF\xEE' + urandom(size_mb * 2 ** 20)
+    cases = [('raw bytes', raw), ('base64 bytes', b64encode(raw))]
+    print(f'{"case":<20}{"in process s":>15}{"pool s":>15}')
+    with ProcessPoolExecutor(processes) as executor:
+        # Start the worker processes before measuring
+        list(executor.map(_prepare_document, [{'content': b'warm up'}] * processes))
+        for name, content in cases:
+            documents = [{'content': content, 'metadata': {'i': i}} for i in range(count)]
+            in_process = measure(map, documents)
+            pool = measure(executor.map, documents)
+            print(f'{name:<20}{in_process:>15.2f}{pool:>15.2f}')
+
+
+if __name__ == '__main__':
+    args = [int(arg) for arg in sys.argv[1:]]
+    main(*args + [50, 5, 4][len(args):])
@@ -3,12 +3,32 @@ import logging
 import os
 import traceback
 
-from .client import Client
+from .batch import Batch, BatchError
+from .bulk import BulkResult
+from .cache import PredictionCache, PredictionStore, SQLitePredictionCache
+from .client import Base64Content, Client, RawContent
 from .credentials import Credentials
+from .hedging import HedgePolicy
+from .retry import RetryBudget, RetryPolicy
+from .timeline import Timeline
+from .timeouts import Timeout
 
 __all__ = [
+    'Base64Content',
+    'Batch',
+    'BatchError',
+    'BulkResult',
     'Client',
     'Credentials',
+    'HedgePolicy',
+    'PredictionCache',
+    'PredictionStore',
+    'RawContent',
+    'RetryBudget',
+    'RetryPolicy',
+    'SQLitePredictionCache',
+    'Timeline',
+    'Timeout',
 ]
 
 logging.getLogger(__name__).addHandler(logging.NullHandler())
@@ -7,4 +7,4 @@ __maintainer__ = 'Magnus Aarskaug Rud'
 __maintainer_email__ ='magnus@lucidtech.ai'
 __title__ = 'lucidtech-las'
 __url__ = 'https://github.com/LucidtechAI/las-sdk-python'
-__version__ = '11.4.1'
+__version__ = '11.5.0'
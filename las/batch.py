@@ -0,0 +1,115 @@
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, NamedTuple, Tuple
+
+from .bulk import BulkResult, run_concurrently
+
+
+class BatchCall(NamedTuple):
+    """A call queued in a :py:class:`Batch`.
+
+    :param method: Name of the method of the client
+    :type method: str
+    :param args: Positional arguments of the call
+    :type args: tuple
+    :param kwargs: Keyword arguments of the call
+    :type kwargs: dict"""
+    method: str
+    args: Tuple[Any, ...]
+    kwargs: Dict[str, Any]
+
+
+class BatchError(Exception):
+    """A BatchError is raised by :py:meth:`Batch.raise_for_failures` if calls of the batch failed.
+    The failed calls are available as failures."""
+    def __init__(self, *args, failures: List[BulkResult]):
+        super().__init__(*args)
+        self.failures = failures
+
+
+class Batch:
+    """Queues calls to the methods of a client, and makes them concurrently when the with block exits.
+    Each queued call returns a :py:class:`concurrent.futures.Future` that holds its response once the batch has run.
+    Failures are captured per call instead of aborting the remaining calls. The calls are not made if the block
+    raises an exception.
+
+    >>> from las.client import Client
+    >>> client = Client(max_requests_per_second=10)
+    >>> with client.batch(max_concurrency=8) as batch:
+    ...     for document_id, ground_truth in ground_truths.items():
+    ...         batch.update_document(document_id, ground_truth=ground_truth)
+    >>> batch.raise_for_failures()
+
+    :param client: Client whose methods are called
+    :type client: :py:class:`~las.Client`
+    :param max_concurrency: Maximum number of calls in flight
+    :type max_concurrency: int"""
+
+    def __init__(self, client: Any, max_concurrency: int = 8):
+        self.client = client
+        self.max_concurrency = max_concurrency
+        self.results: List[BulkResult] = []
+        self._calls: List[Tuple[BatchCall, Future]] = []
+
+    def __getattr__(self, name: str) -> Callable[..., Future]:
+        if name.startswith('_') or not callable(getattr(self.client, name, None)):
+            raise AttributeError(f'{type(self.client).__name__} has no public method {name}')
+
+        def queue(*args: Any, **kwargs: Any) -> Future:
+            future: Future = Future()
+            self._calls.append((BatchCall(name, args, kwargs), future))
+            return future
+        return queue
+
+    def __enter__(self) -> 'Batch':
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        if exc_type is None:
+            self.run()
+        else:
+            for _, future in self._calls:
+                future.cancel()
+            self._calls = []
+
+    def run(self) -> List[BulkResult]:
+        """Make the queued calls, and return a :py:class:`~las.BulkResult` per call in the order they were queued.
+        Called when the with block exits."""
+        # Calls whose future was cancelled are not made
+        calls = [(batch_call, future) for batch_call, future in self._calls if future.set_running_or_notify_cancel()]
+        self._calls = []
+
+        def call(batch_call: BatchCall) -> Any:
+            return getattr(self.client, batch_call.method)(*batch_call.args, **batch_call.kwargs)
+
+        with ThreadPoolExecutor(self.max_concurrency) as executor:
+            results = list(run_concurrently(
+                lambda batch_call: executor.submit(self.client._queued(batch_call.method, call), batch_call),
+                [batch_call for batch_call, _ in calls],
+                max_pending=2 * self.max_concurrency,
+            ))
+
+        for result, (_, future) in zip(results, calls):
+            if result.ok:
+                future.set_result(result.result)
+            else:
+                future.set_exception(result.error)  # type: ignore
+        self.results.extend(results)
+        return results
+
+    @property
+    def failures(self) -> List[BulkResult]:
+        return [result for result in self.results if not result.ok]
+
+    def failures_by_error(self) -> Dict[str, List[BulkResult]]:
+        """Failed calls grouped by the name of the exception they raised, e.g. NotFound."""
+        groups: Dict[str, List[BulkResult]] = {}
+        for result in self.failures:
+            groups.setdefault(type(result.error).__name__, []).append(result)
+        return groups
+
+    def raise_for_failures(self) -> None:
+        """Raise a :py:class:`BatchError` with the failed calls, if any call failed."""
+        failures = self.failures
+        if failures:
+            summary = ', '.join(f'{len(group)} {error}' for error, group in self.failures_by_error().items())
+            raise BatchError(f'{len(failures)} of {len(self.results)} calls failed: {summary}', failures=failures)
@@ -0,0 +1,79 @@
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, Future, wait
+from typing import Any, Callable, Deque, Iterable, Iterator, NamedTuple, Optional, Tuple
+
+
+class BulkResult(NamedTuple):
+    """The outcome of a single item in a bulk operation.
+
+    :param position: Position of the item in the input
+    :type position: int
+    :param item: The input item
+    :type item: Any
+    :param result: Response from REST API, None if the item failed
+    :type result: Any
+    :param error: Exception raised while processing the item, None if the item succeeded
+    :type error: Exception, optional"""
+    position: int
+    item: Any
+    result: Any = None
+    error: Optional[BaseException] = None
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+    def unwrap(self) -> Any:
+        """Return the result, or raise the error if the item failed."""
+        if self.error is not None:
+            raise self.error
+        return self.result
+
+
+def _to_result(index: int, item: Any, future: Future) -> BulkResult:
+    if future.cancelled():
+        return BulkResult(index, item)
+    error = future.exception()
+    return BulkResult(index, item, None if error else future.result(), error)
+
+
+def run_concurrently(
+    submit: Callable[[Any], Future],
+    items: Iterable[Any],
+    *,
+    max_pending: int,
+    ordered: bool = True,
+) -> Iterator[BulkResult]:
+    """Submit items lazily, keeping at most max_pending futures in flight, and yield a
+    :py:class:`BulkResult` per item, either in input order or in completion order.
+    Futures that are still pending when the iterator is closed are cancelled."""
+    pending: Deque[Tuple[int, Any, Future]] = deque()
+    items_iterator = enumerate(items)
+    exhausted = False
+
+    try:
+        while True:
+            while not exhausted and len(pending) < max_pending:
+                try:
+                    index, item = next(items_iterator)
+                except StopIteration:
+                    exhausted = True
+                    break
+                pending.append((index, item, submit(item)))
+
+            if not pending:
+                return
+
+            if ordered:
+                index, item, future = pending.popleft()
+                wait([future])
+            else:
+                done, _ = wait([future for _, _, future in pending], return_when=FIRST_COMPLETED)
+                entry = next(entry for entry in pending if entry[2] in done)
+                pending.remove(entry)
+                index, item, future = entry
+
+            yield _to_result(index, item, future)
+    finally:
+        for _, _, future in pending:
+            future.cancel()
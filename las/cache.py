@@ -0,0 +1,304 @@
+import copy
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple, Union
+
+
+class PredictionCache:
+    """An in-memory cache of predictions, keyed by the hash of the document content and the model configuration,
+    so that predicting again on byte-identical documents returns the stored prediction instead of calling the API.
+
+    The cache learns the content hash of the documents uploaded by the client, and is consulted by
+    :py:meth:`~las.Client.create_prediction` for those documents. The least recently used predictions are evicted
+    when the cache holds more than max_entries predictions. The number of hits, misses and evictions is counted.
+
+    >>> from las import Client, PredictionCache
+    >>> client = Client(prediction_cache=PredictionCache(max_entries=10000, ttl=24 * 3600))
+
+    :param max_entries: Maximum number of predictions to keep
+    :type max_entries: int
+    :param ttl: Number of seconds a prediction is kept, forever if omitted
+    :type ttl: float, optional
+    :param max_documents: Maximum number of document ids whose content hash is remembered
+    :type max_documents: int"""
+
+    def __init__(self, max_entries: int = 1024, ttl: Optional[float] = None, max_documents: int = 100_000):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.max_documents = max_documents
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._documents: 'OrderedDict[str, str]' = OrderedDict()
+        self._predictions: 'OrderedDict[str, Tuple[float, Dict]]' = OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def key(
+        digest: str,
+        model_id: str,
+        training_id: Optional[str] = None,
+        preprocess_config: Optional[dict] = None,
+        postprocess_config: Optional[dict] = None,
+    ) -> str:
+        config = json.dumps([digest, model_id, training_id, preprocess_config, postprocess_config], sort_keys=True)
+        return hashlib.sha256(config.encode()).hexdigest()
+
+    @property
+    def hit_rate(self) -> float:
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+    def remember_document(self, document_id: str, content: Union[bytes, bytearray, memoryview, Any]) -> None:
+        """Remember the content hash of a document uploaded by the client."""
+        digest = hashlib.sha256(content).hexdigest()
+        with self._lock:
+            self._documents[document_id] = digest
+            self._documents.move_to_end(document_id)
+            while len(self._documents) > self.max_documents:
+                self._documents.popitem(last=False)
+
+    def document_digest(self, document_id: str) -> Optional[str]:
+        with self._lock:
+            return self._documents.get(document_id)
+
+    def get(self, key: str) -> Optional[Dict]:
+        """The prediction stored for key, None if there is none or it has expired."""
+        with self._lock:
+            entry = self._load(key)
+            if entry is not None and self.ttl is not None and time.time() - entry[0] > self.ttl:
+                self._delete(key)
+                entry = None
+            if entry is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+            return entry[1]
+
+    def put(self, key: str, prediction: Dict) -> None:
+        with self._lock:
+            self._store(key, time.time(), prediction)
+            self.evictions += self._evict()
+
+    def summary(self) -> Dict:
+        return {'hits': self.hits, 'misses': self.misses, 'hitRate': self.hit_rate, 'evictions': self.evictions}
+
+    def __getstate__(self) -> dict:
+        # Locks can not be pickled, so that clients can be passed to other processes
+        with self._lock:
+            state = self.__dict__.copy()
+            state['_documents'] = self._documents.copy()
+            state['_predictions'] = self._predictions.copy()
+        del state['_lock']
+        return state
+
+    def __setstate__(self, state: dict) -> None:
+        self.__dict__.update(state)
+        self._lock = threading.Lock()
+
+    def _load(self, key: str) -> Optional[Tuple[float, Dict]]:
+        entry = self._predictions.get(key)
+        if entry is None:
+            return None
+        self._predictions.move_to_end(key)
+        return entry[0], copy.deepcopy(entry[1])
+
+    def _store(self, key: str, created: float, prediction: Dict) -> None:
+        self._predictions[key] = (created, copy.deepcopy(prediction))
+        self._predictions.move_to_end(key)
+
+    def _delete(self, key: str) -> None:
+        self._predictions.pop(key, None)
+
+    def _evict(self) -> int:
+        evicted = 0
+        while len(self._predictions) > self.max_entries:
+            self._predictions.popitem(last=False)
+            evicted += 1
+        return evicted
+
+
+class SQLitePredictionCache(PredictionCache):
+    """A :py:class:`PredictionCache` that stores predictions in an SQLite database, so that they are shared by
+    processes and kept across restarts.
+
+    :param path: Path to the database file, created if it does not exist
+    :type path: Union [ str, Path ]
+    :param max_entries: Maximum number of predictions to keep
+    :type max_entries: int
+    :param ttl: Number of seconds a prediction is kept, forever if omitted
+    :type ttl: float, optional
+    :param max_documents: Maximum number of document ids whose content hash is remembered
+    :type max_documents: int"""
+
+    def __init__(
+        self,
+        path: Union[str, Path],
+        max_entries: int = 100_000,
+        ttl: Optional[float] = None,
+        max_documents: int = 100_000,
+    ):
+        super().__init__(max_entries=max_entries, ttl=ttl, max_documents=max_documents)
+        self.path = path
+        self._connection = self._connect()
+
+    def _connect(self) -> sqlite3.Connection:
+        connection = sqlite3.connect(str(self.path), check_same_thread=False, isolation_level=None)
+        connection.execute(
+            'CREATE TABLE IF NOT EXISTS predictions '
+            '(key TEXT PRIMARY KEY, created REAL, accessed REAL, prediction TEXT)'
+        )
+        connection.execute('CREATE INDEX IF NOT EXISTS predictions_accessed ON predictions (accessed)')
+        return connection
+
+    def __getstate__(self) -> dict:
+        # Connections can not be pickled, the database is opened again by the process that unpickles the cache
+        state = super().__getstate__()
+        del state['_connection']
+        return state
+
+    def __setstate__(self, state: dict) -> None:
+        super().__setstate__(state)
+        self._connection = self._connect()
+
+    def _load(self, key: str) -> Optional[Tuple[float, Dict]]:
+        row = self._connection.execute('SELECT created, prediction FROM predictions WHERE key = ?', (key,)).fetchone()
+        if row is None:
+            return None
+        self._connection.execute('UPDATE predictions SET accessed = ? WHERE key = ?', (time.time(), key))
+        return row[0], json.loads(row[1])
+
+    def _store(self, key: str, created: float, prediction: Dict) -> None:
+        self._connection.execute(
+            'INSERT OR REPLACE INTO predictions (key, created, accessed, prediction) VALUES (?, ?, ?, ?)',
+            (key, created, created, json.dumps(prediction)),
+        )
+
+    def _delete(self, key: str) -> None:
+        self._connection.execute('DELETE FROM predictions WHERE key = ?', (key,))
+
+    def _evict(self) -> int:
+        count, = self._connection.execute('SELECT COUNT(*) FROM predictions').fetchone()
+        if count <= self.max_entries:
+            return 0
+        self._connection.execute(
+            'DELETE FROM predictions WHERE key IN (SELECT key FROM predictions ORDER BY accessed LIMIT ?)',
+            (count - self.max_entries,),
+        )
+        return count - self.max_entries
+
+    def close(self) -> None:
+        self._connection.close()
+
+
+class PredictionStore:
+    """A persistent store of predictions in an SQLite database. Predictions do not change once created, so
+    :py:meth:`~las.Client.get_prediction` serves the predictions that were created or fetched before from the store,
+    and :py:meth:`~las.Client.sync_predictions` only fetches the predictions created since the last sync.
+
+    >>> from las import Client, PredictionStore
+    >>> client = Client(prediction_store=PredictionStore('predictions.db'))
+
+    :param path: Path to the database file, created if it does not exist
+    :type path: Union [ str, Path ]"""
+
+    def __init__(self, path: Union[str, Path]):
+        self.hits = 0
+        self.misses = 0
+        self.path = path
+        self._lock = threading.Lock()
+        self._connection = self._connect()
+
+    def _connect(self) -> sqlite3.Connection:
+        connection = sqlite3.connect(str(self.path), check_same_thread=False, isolation_level=None)
+        for table in ['predictions', 'listed_predictions']:
+            connection.execute(
+                f'CREATE TABLE IF NOT EXISTS {table} '
+                '(prediction_id TEXT PRIMARY KEY, model_id TEXT, created_time TEXT, prediction TEXT)'
+            )
+        connection.execute('CREATE TABLE IF NOT EXISTS watermarks (scope TEXT PRIMARY KEY, created_time TEXT)')
+        return connection
+
+    @property
+    def hit_rate(self) -> float:
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+    def get(self, prediction_id: str) -> Optional[Dict]:
+        with self._lock:
+            row = self._connection.execute(
+                'SELECT prediction FROM predictions WHERE prediction_id = ?', (prediction_id,),
+            ).fetchone()
+            if row is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+            return json.loads(row[0])
+
+    def put(self, prediction: Dict) -> None:
+        self._put('predictions', [prediction])
+
+    def put_listed(self, predictions: List[Dict]) -> None:
+        self._put('listed_predictions', predictions)
+
+    def listed(self, model_id: Optional[str] = None) -> List[Dict]:
+        """Predictions stored by :py:meth:`~las.Client.sync_predictions`, most recently created first."""
+        query = 'SELECT prediction FROM listed_predictions'
+        query += ' WHERE model_id = ?' if model_id else ''
+        with self._lock:
+            rows = self._connection.execute(
+                f'{query} ORDER BY created_time DESC, prediction_id', (model_id,) if model_id else (),
+            ).fetchall()
+        return [json.loads(row[0]) for row in rows]
+
+    def knows_listed(self, prediction_id: str) -> bool:
+        with self._lock:
+            return self._connection.execute(
+                'SELECT 1 FROM listed_predictions WHERE prediction_id = ?', (prediction_id,),
+            ).fetchone() is not None
+
+    def watermark(self, model_id: Optional[str] = None) -> Optional[str]:
+        """The createdTime of the most recent prediction seen by the last sync."""
+        with self._lock:
+            row = self._connection.execute(
+                'SELECT created_time FROM watermarks WHERE scope = ?', (model_id or '',),
+            ).fetchone()
+        return row[0] if row else None
+
+    def set_watermark(self, created_time: str, model_id: Optional[str] = None) -> None:
+        with self._lock:
+            self._connection.execute(
+                'INSERT OR REPLACE INTO watermarks (scope, created_time) VALUES (?, ?)', (model_id or '', created_time),
+            )
+
+    def _put(self, table: str, predictions: List[Dict]) -> None:
+        rows = [
+            (p['predictionId'], p.get('modelId'), p.get('createdTime'), json.dumps(p))
+            for p in predictions if p.get('predictionId')
+        ]
+        with self._lock:
+            self._connection.executemany(
+                f'INSERT OR REPLACE INTO {table} (prediction_id, model_id, created_time, prediction) '
+                'VALUES (?, ?, ?, ?)',
+                rows,
+            )
+
+    def close(self) -> None:
+        self._connection.close()
+
+    def __getstate__(self) -> dict:
+        # Locks and connections can not be pickled, the database is opened again by the process that unpickles
+        # the store
+        state = self.__dict__.copy()
+        del state['_lock'], state['_connection']
+        return state
+
+    def __setstate__(self, state: dict) -> None:
+        self.__dict__.update(state)
+        self._lock = threading.Lock()
+        self._connection = self._connect()
@@ -1,21 +1,64 @@
 import binascii
 import filetype
+import hashlib
 import io
 import json
 import logging
+import mmap
+import string
+import threading
+import time
 from base64 import b64encode, b64decode
+from concurrent.futures import (
+    CancelledError,
+    Future,
+    ProcessPoolExecutor,
+    ThreadPoolExecutor,
+    TimeoutError as FutureTimeoutError,
+)
+from contextlib import closing, contextmanager
+from contextvars import ContextVar
 from datetime import datetime
 from functools import singledispatch
 from pathlib import Path
 from json.decoder import JSONDecodeError
-from typing import Any, Callable, Dict, List, Optional, Sequence, Union
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Mapping, Optional, Sequence, Union
 from urllib.parse import urlparse, quote
+from uuid import uuid4
 
 import requests
-from backoff import expo, on_exception  # type: ignore
-from requests.exceptions import RequestException
+from backoff import on_exception  # type: ignore
 
+from .batch import Batch
+from .bulk import BulkResult, run_concurrently
+from .cache import PredictionCache, PredictionStore
 from .credentials import Credentials, guess_credentials
+from .diagnostics import request_with_phases
+from .hedging import HedgePolicy
+from .predictions import (
+    MAX_PAGES_PER_PREDICTION,
+    AdaptiveQualityStats,
+    low_confidence_fields,
+    merge_predictions,
+    page_windows,
+)
+from .rate_limit import RateLimiter
+from .retry import RateLimitStatus, RetryBudget, RetryPolicy, parse_rate_limit, retry_delay
+from .singleflight import SingleFlight
+from .stats import Stats, StatsRecorder, endpoint_template
+from .streaming import Base64JSONBody
+from .tracing import http_span, on_backoff, traced_methods
+from .timeline import Timeline
+from .timeouts import (  # noqa: F401
+    API_TIMEOUT,
+    FILESERVER_TIMEOUT,
+    DeadlineExceeded,
+    Timeout,
+    bounded,
+    bounded_wait_gen,
+    deadline,
+    remaining_time,
+)
 
 
 logger = logging.getLogger(__name__)
@@ -23,7 +66,40 @@ handler = logging.StreamHandler()
 handler.setFormatter(logging.Formatter('%(asctime)s %(name)-12s %(levelname)-8s %(message)s'))
 logger.addHandler(handler)
 
-Content = Union[bytes, bytearray, str, Path, io.IOBase]
+# filetype only inspects the first bytes of a file to determine its type
+_SIGNATURE_LENGTH = 8192
+_BASE64_SIGNATURE_LENGTH = 4 * -(-_SIGNATURE_LENGTH // 3)
+_BASE64_ALPHABET = (string.ascii_letters + string.digits + '+/').encode()
+_BASE64_PREFIX_LENGTH = 1024
+_BASE64_CHUNK_LENGTH = 2 ** 20
+
+# Bodies longer than this are logged as a prefix with their size and hash
+_LOG_BODY_LENGTH = 2048
+_LOG_BODY_PREFIX_LENGTH = 256
+
+# Details of the latest HTTP attempt of the current call, collected for the slow request log
+_last_attempt: ContextVar[Optional[Dict[str, Any]]] = ContextVar('last_attempt', default=None)
+
+
+class RawContent:
+    """Wraps bytes that are not base64 encoded, so that :py:func:`parse_content` does not have to detect it.
+
+    :param data: The content
+    :type data: Union[bytes, bytearray]"""
+    def __init__(self, data: Union[bytes, bytearray]):
+        self.data = data
+
+
+class Base64Content:
+    """Wraps base64 encoded content, so that :py:func:`parse_content` neither has to detect nor validate it.
+
+    :param data: The base64 encoded content
+    :type data: Union[bytes, bytearray, str]"""
+    def __init__(self, data: Union[bytes, bytearray, str]):
+        self.data = data
+
+
+Content = Union[bytes, bytearray, str, Path, io.IOBase, RawContent, Base64Content]
 Queryparam = Union[str, List[str]]
 
 
@@ -40,8 +116,23 @@ def dictstrip(d):
     return {k: v for k, v in d.items() if v is not None}
 
 
-def _fatal_code(e):
-    return 400 <= e.response.status_code < 500
+def _method(requests_fn: Callable) -> str:
+    return getattr(requests_fn, '__name__', 'request').upper()
+
+
+def _body_summary(content: bytes) -> str:
+    if len(content) <= _LOG_BODY_LENGTH:
+        return content.decode(errors='replace')
+    prefix = content[:_LOG_BODY_PREFIX_LENGTH].decode(errors='replace')
+    return f'{prefix}... ({len(content)} bytes, sha256 {hashlib.sha256(content).hexdigest()[:16]})'
+
+
+def _body_size(data: Any) -> int:
+    if data is None:
+        return 0
+    if isinstance(data, str):
+        return len(data.encode())
+    return len(data)
 
 
 def _decode_response(response, return_json=True):
@@ -56,10 +147,10 @@ def _decode_response(response, return_json=True):
         if response.status_code == 204:
             return {'Your request executed successfully': '204'}
 
-        logger.error('Status code {} body:\n{}'.format(response.status_code, response.text))
+        logger.error('Status code {} body:\n{}'.format(response.status_code, _body_summary(response.content)))
         raise e
     except Exception as e:
-        logger.error('Status code {} body:\n{}'.format(response.status_code, response.text))
+        logger.error('Status code {} body:\n{}'.format(response.status_code, _body_summary(response.content)))
 
         if response.status_code == 400:
             message = response.json().get('message', response.text)
@@ -73,7 +164,10 @@ def _decode_response(response, return_json=True):
             raise NotFound(message)
 
         if response.status_code == 429 and 'Too Many Requests' in response.json().values():
-            raise TooManyRequestsException('You have reached the limit of requests per second.')
+            raise TooManyRequestsException(
+                'You have reached the limit of requests per second.',
+                retry_after=retry_delay(response.headers),
+            )
 
         if response.status_code == 429 and 'Limit Exceeded' in response.json().values():
             raise LimitExceededException('You have reached the limit of total requests per month.')
@@ -82,7 +176,7 @@ def _decode_response(response, return_json=True):
 
 
 def _guess_content_type(raw):
-    guessed_type = filetype.guess(raw)
+    guessed_type = filetype.guess(raw[:_SIGNATURE_LENGTH])
     assert guessed_type, 'Could not determine content type of document. ' \
                          'Please provide it by specifying content_type'
     return guessed_type.mime
@@ -94,6 +188,34 @@ def _parsed_content(raw, find_content_type, base_64_encode):
     return parsed_content, content_type
 
 
+def _parsed_base64(encoded, find_content_type, base_64_encode):
+    content_type = _guess_content_type(b64decode(encoded[:_BASE64_SIGNATURE_LENGTH])) if find_content_type else None
+    if base_64_encode:
+        parsed_content = encoded if isinstance(encoded, str) else str(encoded, 'ascii')
+    else:
+        parsed_content = b64decode(encoded)
+    return parsed_content, content_type
+
+
+def _may_be_base64(content):
+    """Cheaply rule out base64 by looking at the length and a short prefix of the content."""
+    prefix = bytes(memoryview(content)[:_BASE64_PREFIX_LENGTH])
+    return len(content) % 4 == 0 and not prefix.rstrip(b'=').translate(None, _BASE64_ALPHABET)
+
+
+def _is_base64(content):
+    """Check that content is padded base64 like b64decode(content, validate=True) does, but validate in chunks
+    instead of allocating the decoded content."""
+    length = len(content)
+    view = memoryview(content)
+    tail = bytes(view[-2:])
+    end = length - (len(tail) - len(tail.rstrip(b'=')))
+    for start in range(0, end, _BASE64_CHUNK_LENGTH):
+        if bytes(view[start:min(start + _BASE64_CHUNK_LENGTH, end)]).translate(None, _BASE64_ALPHABET):
+            return False
+    return True
+
+
 @singledispatch
 def parse_content(content, find_content_type=False, base_64_encode=True):
     raise TypeError(
@@ -104,6 +226,7 @@ def parse_content(content, find_content_type=False, base_64_encode=True):
             '2. Bytes object with b64encoding',
             '3. Bytes object without b64encoding',
             '4. IO Stream of either bytes or text',
+            '5. RawContent or Base64Content to declare whether bytes are base64 encoded',
         ])
     )
 
@@ -118,11 +241,25 @@ def _(content, find_content_type=False, base_64_encode=True):
 @parse_content.register(bytes)
 @parse_content.register(bytearray)
 def _(content, find_content_type=False, base_64_encode=True):
-    try:
-        raw = b64decode(content, validate=True)
-    except binascii.Error:
-        raw = content
-    return _parsed_content(raw, find_content_type, base_64_encode)
+    if _may_be_base64(content):
+        if not base_64_encode:
+            try:
+                return _parsed_content(b64decode(content, validate=True), find_content_type, base_64_encode)
+            except binascii.Error:
+                pass
+        elif _is_base64(content):
+            return _parsed_base64(content, find_content_type, base_64_encode)
+    return _parsed_content(content, find_content_type, base_64_encode)
+
+
+@parse_content.register(RawContent)
+def _(content, find_content_type=False, base_64_encode=True):
+    return _parsed_content(content.data, find_content_type, base_64_encode)
+
+
+@parse_content.register(Base64Content)
+def _(content, find_content_type=False, base_64_encode=True):
+    return _parsed_base64(content.data, find_content_type, base_64_encode)
 
 
 @parse_content.register(io.IOBase)
@@ -132,6 +269,62 @@ def _(content, find_content_type=False, base_64_encode=True):
     return _parsed_content(raw, find_content_type, base_64_encode)
 
 
+@contextmanager
+def _raw_content(content):
+    """The content that is not base64 encoded, to be sent in the block. Files given by path are memory-mapped
+    read-only until the block exits, so that uploads and base64 encoding are backed by the page cache instead of
+    a private copy on the heap. Files that can not be mapped, such as empty files and pipes, are read instead."""
+    if not isinstance(content, (str, Path)):
+        yield parse_content(content, False, False)[0]
+        return
+
+    with open(content, 'rb') as fp:
+        try:
+            mapped = mmap.mmap(fp.fileno(), 0, access=mmap.ACCESS_READ)
+        except (ValueError, OSError):
+            yield fp.read()
+            return
+    with closing(mapped):
+        yield mapped
+
+
+def _document_body(
+    *,
+    consent_id: Optional[str] = None,
+    dataset_id: Optional[str] = None,
+    ground_truth: Optional[Sequence[Dict[str, str]]] = None,
+    retention_in_days: Optional[int] = None,
+    metadata: Optional[dict] = None,
+) -> Dict:
+    return dictstrip({
+        'consentId': consent_id,
+        'datasetId': dataset_id,
+        'groundTruth': ground_truth,
+        'metadata': metadata,
+        'retentionInDays': retention_in_days,
+    })
+
+
+def _needs_preparation(content: Any) -> bool:
+    """Whether content has to be validated or decoded as base64, which is worth the cost of pickling it to and from
+    a worker process. Raw bytes, paths and file objects are cheaper to handle in the calling process."""
+    if isinstance(content, Base64Content):
+        return True
+    return isinstance(content, (bytes, bytearray)) and _may_be_base64(content)
+
+
+def _prepare_document(kwargs: Dict[str, Any]) -> Dict[str, Any]:
+    """Do the CPU bound part of creating a document, decoding the content and JSON encoding the body of
+    POST /documents, so that it can run in a worker process. Content given as a path is passed on as is, to be
+    memory-mapped by the uploading process instead of copied between processes."""
+    kwargs = dict(kwargs)
+    content = kwargs.pop('content')
+    idempotency_key = kwargs.pop('idempotency_key', None)
+    if not isinstance(content, (str, Path)):
+        content = RawContent(parse_content(content, False, False)[0])
+    return {'content': content, 'body': json.dumps(_document_body(**kwargs)), 'idempotency_key': idempotency_key}
+
+
 class EmptyRequestError(ValueError):
     """An EmptyRequestError is raised if the request body is empty when expected not to be empty."""
     pass
@@ -150,8 +343,13 @@ class InvalidCredentialsException(ClientException):
 
 class TooManyRequestsException(ClientException):
     """A TooManyRequestsException is raised if you have reached the number of requests per second limit
-    associated with your credentials."""
-    pass
+    associated with your credentials. The number of seconds the server asked us to wait before retrying
+    is available as retry_after, if given."""
+    status_code = 429
+
+    def __init__(self, *args, retry_after: Optional[float] = None):
+        super().__init__(*args)
+        self.retry_after = retry_after
 
 
 class LimitExceededException(ClientException):
@@ -175,52 +373,348 @@ class FileFormatException(ClientException):
     pass
 
 
+@traced_methods
 class Client:
-    """A low level client to invoke api methods from Lucidtech AI Services."""
-    def __init__(self, credentials: Optional[Credentials] = None, profile=None):
+    """A low level client to invoke api methods from Lucidtech AI Services. A client can be shared by many threads,
+    which share its credentials, rate limiter, retry budget and stats."""
+    def __init__(
+        self,
+        credentials: Optional[Credentials] = None,
+        profile=None,
+        *,
+        max_requests_per_second: Optional[float] = None,
+        retry_policy: Optional[RetryPolicy] = None,
+        retry_budget: Optional[RetryBudget] = None,
+        api_timeout: Timeout = API_TIMEOUT,
+        fileserver_timeout: Timeout = FILESERVER_TIMEOUT,
+        coalesce_requests: bool = False,
+        hedge_policy: Optional[HedgePolicy] = None,
+        timeline: Optional[Timeline] = None,
+        connection_diagnostics: bool = False,
+        slow_request_threshold: Optional[float] = None,
+        prediction_cache: Optional[PredictionCache] = None,
+        prediction_store: Optional[PredictionStore] = None,
+    ):
         """:param credentials: Credentials to use, instance of :py:class:`~las.Credentials`
-        :type credentials: Credentials"""
+        :type credentials: Credentials
+        :param max_requests_per_second: Limit the rate of API requests made by this client, shared by all threads
+        :type max_requests_per_second: float, optional
+        :param retry_policy: Which failed requests to retry and how long to wait between attempts
+        :type retry_policy: :py:class:`~las.RetryPolicy`, optional
+        :param retry_budget: Token bucket shared by all requests of this client that limits the number of retries
+        :type retry_budget: :py:class:`~las.RetryBudget`, optional
+        :param api_timeout: Connect and read timeouts for requests to the API
+        :type api_timeout: :py:class:`~las.Timeout`, optional
+        :param fileserver_timeout: Connect and read timeouts for uploads and downloads of document content
+        :type fileserver_timeout: :py:class:`~las.Timeout`, optional
+        :param coalesce_requests: Let identical GET requests made concurrently by different threads share one \
+            request to the API. Coalesced calls return the same response object, which must be treated as \
+            read-only. The number of requests saved is counted by singleflight.coalesced
+        :type coalesce_requests: bool, optional
+        :param hedge_policy: Send a second GET request when the first is slower than most recent requests, \
+            and use whichever answers first
+        :type hedge_policy: :py:class:`~las.HedgePolicy`, optional
+        :param timeline: Record the phases of every request, to be exported as a Chrome trace
+        :type timeline: :py:class:`~las.Timeline`, optional
+        :param connection_diagnostics: Measure DNS resolution, TCP connect, TLS handshake, time to first byte and \
+            body transfer of every HTTP attempt, reported by :py:meth:`stats` and recorded in the timeline
+        :type connection_diagnostics: bool, optional
+        :param slow_request_threshold: Log a warning with the endpoint, attempts, sizes and phase timings of calls \
+            that take longer than this number of seconds
+        :type slow_request_threshold: float, optional
+        :param prediction_cache: Return stored predictions for documents whose content was uploaded before, \
+            instead of predicting again
+        :type prediction_cache: :py:class:`~las.PredictionCache`, optional
+        :param prediction_store: Keep the predictions created and fetched by the client on disk, so that \
+            :py:meth:`get_prediction` fetches each prediction once and :py:meth:`sync_predictions` fetches \
+            only new predictions
+        :type prediction_store: :py:class:`~las.PredictionStore`, optional"""
         self.credentials = credentials or guess_credentials(profile)
+        self.rate_limiter = RateLimiter(max_requests_per_second) if max_requests_per_second else None
+        self.rate_limit_status: Optional[RateLimitStatus] = None
+        self.retry_policy = retry_policy or RetryPolicy()
+        self.retry_budget = retry_budget or RetryBudget()
+        self.api_timeout = Timeout(*api_timeout)
+        self.fileserver_timeout = Timeout(*fileserver_timeout)
+        self.singleflight = SingleFlight() if coalesce_requests else None
+        self.hedge_policy = hedge_policy
+        self._stats = StatsRecorder()
+        self.timeline = timeline
+        self.connection_diagnostics = connection_diagnostics
+        self.slow_request_threshold = slow_request_threshold
+        self.adaptive_quality = AdaptiveQualityStats()
+        self.prediction_cache = prediction_cache
+        self.prediction_store = prediction_store
+
+    @staticmethod
+    def deadline(seconds: float):
+        """Context manager that bounds the latency of all calls made inside the block by the current thread.
+        Retries and backoff sleeps stop at the deadline, and attempts are given timeouts that do not outlive it.
+
+        >>> from las.client import Client
+        >>> client = Client()
+        >>> with client.deadline(5):
+        ...     client.get_document('<document id>')
+
+        :param seconds: Number of seconds from now until the deadline
+        :type seconds: float
+
+        :raises: :py:class:`~las.client.DeadlineExceeded` if the deadline passes before a call completes
+        """
+        return deadline(seconds)
+
+    def batch(self, max_concurrency: int = 8) -> Batch:
+        """Queue calls to the methods of the client in a with block, and make them concurrently when it exits.
+        Each queued call returns a :py:class:`concurrent.futures.Future` of its response.
+
+        >>> from las.client import Client
+        >>> client = Client()
+        >>> with client.batch(max_concurrency=8) as batch:
+        ...     for execution_id in execution_ids:
+        ...         batch.delete_workflow_execution('<workflow id>', execution_id)
+        >>> batch.failures_by_error()
+
+        :param max_concurrency: Maximum number of calls in flight
+        :type max_concurrency: int, optional
+        :return: The batch, with a :py:class:`~las.BulkResult` per call as results once the block has exited
+        :rtype: :py:class:`~las.batch.Batch`
+        """
+        return Batch(self, max_concurrency)
+
+    def stats(self, reset: bool = False) -> Stats:
+        """Latency percentiles, error rates and retry counts of the calls made by this client, per endpoint.
+        Endpoints are keyed by method and path with ids left out, e.g. GET /documents/{id}, and file server
+        requests are keyed as GET fileserver and PUT fileserver.
+
+        >>> from las.client import Client
+        >>> client = Client()
+        >>> client.get_document('<document id>')
+        >>> client.stats()['GET /documents/{id}'].p99
+        >>> print(client.stats().report())
+
+        :param reset: Start counting from zero after taking the stats, to report the stats of each interval
+        :type reset: bool, optional
+        :return: Stats per endpoint, which can be merged with the stats of other clients and processes
+        :rtype: :py:class:`~las.stats.Stats`
+        """
+        return self._stats.snapshot(reset=reset)
+
+    def _observe_rate_limit(self, response: requests.Response) -> None:
+        status = parse_rate_limit(response.headers)
+        if status:
+            self.rate_limit_status = status
+
+        if self.rate_limiter:
+            delay = retry_delay(response.headers) if response.status_code in (429, 503) else None
+            if delay is None and status and status.remaining == 0 and status.reset_at is not None:
+                delay = status.reset_at - time.time()
+            if delay and delay > 0:
+                self.rate_limiter.pause(delay)
+
+    def _giveup(self, e: Exception, attempts: int) -> bool:
+        # Backoff asks before it checks max_tries, so the last attempt must not withdraw from the budget
+        if attempts >= self.retry_policy.max_attempts or isinstance(e, DeadlineExceeded):
+            return True
+        remaining = remaining_time()
+        if remaining is not None and remaining <= 0:
+            return True
+        if not self.retry_policy.is_retryable(e):
+            return True
+        if not self.retry_budget.withdraw():
+            logger.warning(f'Retry budget exhausted, giving up on {e!r}')
+            return True
+        return False
+
+    def _coalesced(self, requests_fn: Callable, key: tuple, endpoint: str, send: Callable[[], Any]) -> Any:
+        if not self.singleflight or requests_fn != requests.get:
+            return self._with_retries(endpoint, send)
+
+        try:
+            return self.singleflight.do(key, lambda: self._with_retries(endpoint, send), timeout=remaining_time())
+        except FutureTimeoutError:
+            raise DeadlineExceeded('Deadline exceeded while waiting for a coalesced request')
+
+    def _hedged(self, requests_fn: Callable, key: str, send: Callable[[], Any]) -> Callable[[], Any]:
+        if not self.hedge_policy or requests_fn != requests.get:
+            return send
+        hedge_policy = self.hedge_policy
+        return lambda: hedge_policy.send(key, send)
+
+    def _with_retries(self, endpoint: str, send: Callable[[], Any]) -> Any:
+        attempts = 0
+
+        def attempt():
+            nonlocal attempts
+            attempts += 1
+            return send()
+
+        self.retry_budget.deposit()
+        retrying = on_exception(
+            bounded_wait_gen(self.retry_policy.wait_gen),
+            Exception,
+            max_tries=self.retry_policy.max_attempts,
+            max_time=remaining_time(),
+            giveup=lambda e: self._giveup(e, attempts),
+            on_backoff=[on_backoff, self._on_backoff],
+            jitter=None,
+        )
+        last_attempt: Dict[str, Any] = {}
+        token = _last_attempt.set(last_attempt if self.slow_request_threshold is not None else None)
+        start = time.monotonic()
+        started = self.timeline.now() if self.timeline else 0.0
+        error = True
+        try:
+            result = retrying(attempt)()
+            error = False
+            return result
+        finally:
+            _last_attempt.reset(token)
+            elapsed = time.monotonic() - start
+            self._stats.record(endpoint, elapsed, error=error, retries=max(attempts - 1, 0))
+            if self.timeline:
+                self.timeline.record(endpoint, 'call', started, self.timeline.now(), attempts=attempts, error=error)
+            if self.slow_request_threshold is not None and elapsed >= self.slow_request_threshold:
+                self._log_slow_request(endpoint, elapsed, attempts, error, last_attempt)
+
+    @staticmethod
+    def _log_slow_request(endpoint: str, elapsed: float, attempts: int, error: bool, last_attempt: Dict) -> None:
+        phases = {phase.name: phase.duration for phase in last_attempt.pop('phases', ())}
+        details = [
+            f'{attempts} attempt(s)',
+            'failed' if error else 'succeeded',
+            f'status {last_attempt.get("status")}',
+            f'sent {last_attempt.get("sent", 0)} bytes',
+            f'received {last_attempt.get("received", 0)} bytes',
+            *(f'{phase} {1000 * duration:.1f} ms' for phase, duration in phases.items()),
+        ]
+        logger.warning(
+            f'Slow request {endpoint} took {elapsed:.3f} s: {", ".join(details)}',
+            extra={'slow_request': {
+                'endpoint': endpoint,
+                'seconds': elapsed,
+                'attempts': attempts,
+                'error': error,
+                'phases': phases,
+                **last_attempt,
+            }},
+        )
+
+    def _on_backoff(self, details: Mapping[str, Any]) -> None:
+        if self.timeline:
+            now = self.timeline.now()
+            self.timeline.record('backoff', 'backoff', now, now + details['wait'], attempt=details['tries'])
+
+    def _queued(self, name: str, fn: Callable) -> Callable:
+        """Wrap a function submitted to an executor, to record how long it waited in the queue."""
+        timeline = self.timeline
+        if not timeline:
+            return fn
+        submitted = timeline.now()
+
+        def run(*args, **kwargs):
+            timeline.record_async(name, 'queue', submitted, timeline.now())
+            return fn(*args, **kwargs)
+        return run
+
+    def _acquire_rate_limit(self) -> None:
+        if self.rate_limiter:
+            waited = self.rate_limiter.acquire(timeout=remaining_time())
+            if self.timeline and waited:
+                now = self.timeline.now()
+                self.timeline.record('rate limit', 'rate_limit', now - waited, now)
+
+    def _send(self, requests_fn: Callable, endpoint: str, uri, template: Optional[str] = None, **kwargs):
+        started = self.timeline.now() if self.timeline else 0.0
+        with http_span(endpoint, _method(requests_fn), uri.hostname, template) as span:
+            if self.connection_diagnostics:
+                response, phases = request_with_phases(_method(requests_fn), uri.geturl(), **kwargs)
+            else:
+                response, phases = requests_fn(url=uri.geturl(), **kwargs), []
+            span.set_attribute('http.response.status_code', response.status_code)
+
+        if phases:
+            self._stats.record_phases(endpoint, phases)
+
+        last_attempt = _last_attempt.get()
+        if last_attempt is not None:
+            last_attempt.update(
+                status=response.status_code,
+                sent=_body_size(kwargs.get('data')),
+                received=len(response.content),
+                phases=phases,
+            )
+
+        if self.timeline:
+            ended = self.timeline.now()
+            self.timeline.record(endpoint, 'http', started, ended, status=response.status_code)
+            for phase in phases:
+                self.timeline.record(
+                    phase.name, phase.name, self.timeline.relative(phase.start), self.timeline.relative(phase.end),
+                )
+            if not phases:
+                # requests measures the time until the response headers were parsed, the rest is the body transfer
+                headers_received = min(started + response.elapsed.total_seconds(), ended)
+                self.timeline.record('response', 'response', started, headers_received)
+                self.timeline.record('transfer', 'transfer', headers_received, ended, bytes=len(response.content))
+        return response
 
-    @on_exception(expo, TooManyRequestsException, max_tries=4)
-    @on_exception(expo, RequestException, max_tries=3, giveup=_fatal_code)
     def _make_request(
         self,
         requests_fn: Callable,
         path: str,
-        body: Optional[dict] = None,
+        body: Optional[Union[dict, str, Base64JSONBody]] = None,
         params: Optional[dict] = None,
         extra_headers: Optional[dict] = None,
+        idempotency_key: Optional[str] = None,
     ) -> Dict:
         """Make signed headers, use them to make a HTTP request of arbitrary form and return the result
-        as decoded JSON. Optionally pass a payload to JSON-dump and parameters for the request call."""
+        as decoded JSON. Optionally pass a payload to JSON-dump, an already JSON encoded payload or a streaming body,
+        and parameters for the request call.
+        Failed requests are retried according to the retry policy of the client. POST requests carry an
+        Idempotency-Key header that stays the same across retries, so the server can discard duplicates."""
 
         if not body and requests_fn in [requests.patch]:
             raise EmptyRequestError
 
         kwargs = {'params': params}
-        None if body is None else kwargs.update({'data': json.dumps(body)})
+        if body is not None:
+            kwargs.update({'data': body if isinstance(body, (str, io.IOBase)) else json.dumps(body)})
         uri = urlparse(f'{self.credentials.api_endpoint}{path}')
 
-        headers = {
-            'Authorization': f'Bearer {self.credentials.access_token}',
-            'Content-Type': 'application/json',
-            **(extra_headers or {}),
-        }
-        response = requests_fn(
-            url=uri.geturl(),
-            headers=headers,
-            **kwargs,
-        )
-        return _decode_response(response)
+        if requests_fn == requests.post:
+            extra_headers = {'Idempotency-Key': idempotency_key or str(uuid4()), **(extra_headers or {})}
+        endpoint = f'{_method(requests_fn)} {endpoint_template(path)}'
+
+        def send():
+            if isinstance(body, io.IOBase):
+                body.seek(0)
+
+            self._acquire_rate_limit()
+            headers = {
+                'Authorization': f'Bearer {self.credentials.access_token}',
+                'Content-Type': 'application/json',
+                **(extra_headers or {}),
+            }
+            response = self._send(
+                requests_fn,
+                endpoint,
+                uri,
+                endpoint_template(path),
+                headers=headers,
+                timeout=bounded(self.api_timeout),
+                **kwargs,
+            )
+            self._observe_rate_limit(response)
+            return _decode_response(response)
+
+        key = (uri.geturl(), json.dumps(params, sort_keys=True, default=str), json.dumps(extra_headers, sort_keys=True))
+        return self._coalesced(requests_fn, key, endpoint, self._hedged(requests_fn, 'api', send))
 
-    @on_exception(expo, TooManyRequestsException, max_tries=4)
-    @on_exception(expo, RequestException, max_tries=3, giveup=_fatal_code)
     def _make_fileserver_request(
         self,
         requests_fn: Callable,
         file_url: str,
-        content: Optional[bytes] = None,
+        content: Optional[Union[bytes, bytearray, mmap.mmap]] = None,
         query_params: Optional[dict] = None,
     ) -> Dict:
         if not content and requests_fn == requests.put:
@@ -230,14 +724,25 @@ class Client:
         if content:
             kwargs.update({'data': content})
         uri = urlparse(file_url)
-
-        headers = {'Authorization': f'Bearer {self.credentials.access_token}'}
-        response = requests_fn(
-            url=uri.geturl(),
-            headers=headers,
-            **kwargs,
-        )
-        return _decode_response(response, return_json=False)
+        endpoint = f'{_method(requests_fn)} fileserver'
+
+        def send():
+            if hasattr(content, 'seek'):
+                content.seek(0)  # type: ignore
+
+            headers = {'Authorization': f'Bearer {self.credentials.access_token}'}
+            response = self._send(
+                requests_fn,
+                endpoint,
+                uri,
+                headers=headers,
+                timeout=bounded(self.fileserver_timeout),
+                **kwargs,
+            )
+            return _decode_response(response, return_json=False)
+
+        key = (uri.geturl(), json.dumps(query_params, sort_keys=True, default=str))
+        return self._coalesced(requests_fn, key, endpoint, self._hedged(requests_fn, 'fileserver', send))
 
     def create_app_client(
         self,
@@ -383,12 +888,8 @@ class Client:
         :raises: :py:class:`~las.InvalidCredentialsException`, :py:class:`~las.TooManyRequestsException`,\
  :py:class:`~las.LimitExceededException`, :py:class:`requests.exception.RequestException`
         """
-        content, _ = parse_content(content)
-        body = {
-            'content': content,
-            **optional_args,
-        }
-        return self._make_request(requests.post, '/assets', body=body)
+        with _raw_content(content) as raw, Base64JSONBody(optional_args, 'content', raw) as body:
+            return self._make_request(requests.post, '/assets', body=body)
 
     def list_assets(self, *, max_results: Optional[int] = None, next_token: Optional[str] = None) -> Dict:
         """List assets available, calls the GET /assets endpoint.
@@ -454,8 +955,9 @@ class Client:
         content = optional_args.get('content')
 
         if content:
-            parsed_content, _ = parse_content(content)
-            optional_args['content'] = parsed_content
+            del optional_args['content']
+            with _raw_content(content) as raw, Base64JSONBody(optional_args, 'content', raw) as body:
+                return self._make_request(requests.patch, f'/assets/{asset_id}', body=body)
 
         return self._make_request(requests.patch, f'/assets/{asset_id}', body=optional_args)
 
@@ -733,6 +1235,7 @@ class Client:
         ground_truth: Sequence[Dict[str, str]] = None,
         retention_in_days: int = None,
         metadata: Optional[dict] = None,
+        idempotency_key: Optional[str] = None,
     ) -> Dict:
         """Creates a document, calls the POST /documents endpoint.
 
@@ -755,26 +1258,189 @@ class Client:
         :type retention_in_days: int, optional
         :param metadata: Dictionary that can be used to store additional information
         :type metadata: dict, optional
+        :param idempotency_key: Key that identifies this document when resubmitting it, generated if omitted
+        :type idempotency_key: str, optional
         :return: Document response from REST API
         :rtype: dict
 
         :raises: :py:class:`~las.InvalidCredentialsException`, :py:class:`~las.TooManyRequestsException`,\
- :py:class:`~las.LimitExceededException`, :py:class:`requests.exception.RequestException`
+ :py:class:`~las.LimitExceededException`, :py:class:`requests.exception.RequestException`. If the document was\
+ created but the upload of its content failed, the created document is available as document on the exception
         """
-        content_bytes, _ = parse_content(content, False, False)
+        # Parse the content first, so that a missing file or unsupported content does not leave a document behind
+        with _raw_content(content) as raw:
+            document = self._create_document_record(
+                consent_id=consent_id,
+                dataset_id=dataset_id,
+                ground_truth=ground_truth,
+                retention_in_days=retention_in_days,
+                metadata=metadata,
+                idempotency_key=idempotency_key,
+            )
+            return self.upload_document_content(document, RawContent(raw))
 
-        body = {
-            'consentId': consent_id,
-            'datasetId': dataset_id,
-            'groundTruth': ground_truth,
-            'metadata': metadata,
-            'retentionInDays': retention_in_days,
-        }
+    def _create_document_record(
+        self,
+        *,
+        consent_id: Optional[str] = None,
+        dataset_id: Optional[str] = None,
+        ground_truth: Optional[Sequence[Dict[str, str]]] = None,
+        retention_in_days: Optional[int] = None,
+        metadata: Optional[dict] = None,
+        idempotency_key: Optional[str] = None,
+    ) -> Dict:
+        body = _document_body(
+            consent_id=consent_id,
+            dataset_id=dataset_id,
+            ground_truth=ground_truth,
+            retention_in_days=retention_in_days,
+            metadata=metadata,
+        )
+        return self._make_request(requests.post, '/documents', body=body, idempotency_key=idempotency_key)
+
+    def upload_document_content(self, document: Dict, content: Content) -> Dict:
+        """Uploads the content of a document that has already been created, calls PUT on the fileUrl of the document.
+
+        Use this to resume :py:meth:`create_document` after the upload failed, without creating a new document.
+
+        >>> from las.client import Client
+        >>> from requests.exceptions import RequestException
+        >>> client = Client()
+        >>> try:
+        ...     document = client.create_document(b'<bytes data>', consent_id='<consent id>')
+        ... except RequestException as e:
+        ...     if not hasattr(e, 'document'):
+        ...         raise
+        ...     document = client.upload_document_content(e.document, b'<bytes data>')
+
+        :param document: Document response from REST API containing fileUrl
+        :type document: dict
+        :param content: Content to upload
+        :type content: Content
+        :return: The document
+        :rtype: dict
+
+        :raises: :py:class:`~las.InvalidCredentialsException`, :py:class:`~las.TooManyRequestsException`,\
+ :py:class:`~las.LimitExceededException`, :py:class:`requests.exception.RequestException`, with the document\
+ available as document on the exception
+        """
+        with _raw_content(content) as raw:
+            try:
+                self._make_fileserver_request(requests.put, document['fileUrl'], content=raw)
+            except Exception as e:
+                # The original exception is kept, so that existing handlers still match it
+                e.document = document  # type: ignore
+                raise
 
-        document = self._make_request(requests.post, '/documents', body=dictstrip(body))
-        self._make_fileserver_request(requests.put, document['fileUrl'], content=content_bytes)
+            if self.prediction_cache and 'documentId' in document:
+                self.prediction_cache.remember_document(document['documentId'], raw)
         return document
 
+    def create_documents(
+        self,
+        documents: Iterable[Union[Content, Dict[str, Any]]],
+        *,
+        max_create_concurrency: int = 4,
+        max_upload_concurrency: int = 4,
+        max_pending: Optional[int] = None,
+        max_prepare_processes: Optional[int] = None,
+        ordered: bool = True,
+        **document_args,
+    ) -> Iterator[BulkResult]:
+        """Creates many documents, pipelining the POST /documents calls with the file uploads.
+
+        Document records are created ahead of time while the content of earlier documents is still being
+        uploaded. The two stages run in separate thread pools with independent concurrency limits. The error of
+        a document whose upload failed carries the created document as document, so that the upload can be resumed
+        with :py:meth:`upload_document_content`.
+
+        With max_prepare_processes, validation and decoding of base64 content and JSON encoding of the request body
+        of those documents run in a pool of worker processes, so that ingestion is not limited to one core by the GIL.
+        Raw bytes, which need no decoding, are not copied between processes. File objects are read by the calling
+        process, and paths are memory-mapped by the uploading threads.
+
+        >>> from las.client import Client
+        >>> client = Client()
+        >>> for result in client.create_documents(['a.pdf', 'b.pdf'], consent_id='<consent id>'):
+        ...     print(result.position, result.result['documentId'] if result.ok else result.error)
+
+        :param documents: Content of each document, or dicts with a 'content' key and any other \
+            keyword argument accepted by :py:meth:`create_document`, such as 'idempotency_key' to safely \
+            resubmit documents of a batch that was interrupted
+        :type documents: Iterable [ Union [ Content, Dict [ str, Any ] ] ]
+        :param max_create_concurrency: Maximum number of concurrent POST /documents calls
+        :type max_create_concurrency: int, optional
+        :param max_upload_concurrency: Maximum number of concurrent file uploads
+        :type max_upload_concurrency: int, optional
+        :param max_pending: Maximum number of documents in flight, defaults to twice the sum of the concurrency limits
+        :type max_pending: int, optional
+        :param max_prepare_processes: Number of worker processes that prepare documents before they are created, \
+            by default documents are prepared by the threads that create them
+        :type max_prepare_processes: int, optional
+        :param ordered: Yield results in input order if True, in completion order if False
+        :type ordered: bool, optional
+        :param document_args: Keyword arguments to :py:meth:`create_document` shared by all documents
+        :return: Iterator of results, one per input document
+        :rtype: Iterator [ :py:class:`~las.BulkResult` ]
+        """
+        max_pending = max_pending or 2 * (max_create_concurrency + max_upload_concurrency)
+        prepare_executor = ProcessPoolExecutor(max_prepare_processes) if max_prepare_processes else None
+
+        with ThreadPoolExecutor(max_upload_concurrency) as upload_executor:
+            with ThreadPoolExecutor(max_create_concurrency) as create_executor:
+
+                def upload(future, document, content):
+                    try:
+                        future.set_result(self.upload_document_content(document, content))
+                    except Exception as e:
+                        future.set_exception(e)
+
+                def create(future, kwargs):
+                    if not future.set_running_or_notify_cancel():
+                        return
+                    content = kwargs.pop('content')
+                    try:
+                        if isinstance(content, (str, Path)):
+                            # Files are memory-mapped by the upload, only check that they can be read
+                            open(content, 'rb').close()
+                        else:
+                            content = RawContent(parse_content(content, False, False)[0])
+                        if 'body' in kwargs:
+                            document = self._make_request(requests.post, '/documents', **kwargs)
+                        else:
+                            document = self._create_document_record(**kwargs)
+                    except Exception as e:
+                        future.set_exception(e)
+                        return
+                    upload_executor.submit(self._queued('upload', upload), future, document, content)
+
+                def prepared(future, prepare_future):
+                    if prepare_future.exception() is None:
+                        create_executor.submit(self._queued('create', create), future, prepare_future.result())
+                    elif future.set_running_or_notify_cancel():
+                        future.set_exception(prepare_future.exception())
+
+                def submit(item):
+                    kwargs = {**document_args, **item} if isinstance(item, dict) else {**document_args, 'content': item}
+                    kwargs.pop('content_type', None)
+                    future: Future = Future()
+
+                    if prepare_executor and isinstance(kwargs['content'], io.IOBase):
+                        kwargs['content'] = kwargs['content'].read()
+                    if prepare_executor and _needs_preparation(kwargs['content']):
+                        prepare_executor.submit(_prepare_document, kwargs).add_done_callback(
+                            lambda prepare_future: prepared(future, prepare_future)
+                        )
+                    else:
+                        create_executor.submit(self._queued('create', create), future, kwargs)
+                    return future
+
+                try:
+                    yield from run_concurrently(submit, documents, max_pending=max_pending, ordered=ordered)
+                finally:
+                    if prepare_executor:
+                        prepare_executor.shutdown()
+
     def list_documents(
         self,
         *,
@@ -1532,6 +2198,7 @@ class Client:
         preprocess_config: Optional[dict] = None,
         postprocess_config: Optional[dict] = None,
         run_async: Optional[bool] = None,
+        idempotency_key: Optional[str] = None,
     ) -> Dict:
         """Create a prediction on a document using specified model, calls the POST /predictions endpoint.
 
@@ -1574,12 +2241,23 @@ class Client:
         :type postprocess_config: dict, optional
         :param run_async: If True run the prediction async, if False run sync. if omitted run synchronously.
         :type run_async: bool
-        :return: Prediction response from REST API
+        :param idempotency_key: Key that identifies this prediction when resubmitting it, generated if omitted
+        :type idempotency_key: str, optional
+        :return: Prediction response from REST API. With a prediction cache, a synchronous prediction on a document \
+            whose content was uploaded before is the stored prediction, with the documentId of this document
         :rtype: dict
 
         :raises: :py:class:`~las.InvalidCredentialsException`, :py:class:`~las.TooManyRequestsException`,\
  :py:class:`~las.LimitExceededException`, :py:class:`requests.exception.RequestException`
         """
+        cache, cache_key = self.prediction_cache, None
+        digest = cache.document_digest(document_id) if cache and not run_async else None
+        if cache and digest:
+            cache_key = cache.key(digest, model_id, training_id, preprocess_config, postprocess_config)
+            cached = cache.get(cache_key)
+            if cached is not None:
+                return {**cached, 'documentId': document_id}
+
         body = {
             'documentId': document_id,
             'modelId': model_id,
@@ -1588,7 +2266,169 @@ class Client:
             'postprocessConfig': postprocess_config,
             'async': run_async,
         }
-        return self._make_request(requests.post, '/predictions', body=dictstrip(body))
+        prediction = self._make_request(
+            requests.post,
+            '/predictions',
+            body=dictstrip(body),
+            idempotency_key=idempotency_key,
+        )
+        if cache and cache_key:
+            cache.put(cache_key, prediction)
+        if self.prediction_store and prediction.get('predictions') is not None:
+            self.prediction_store.put(prediction)
+        return prediction
+
+    def create_adaptive_prediction(
+        self,
+        document_id: str,
+        model_id: str,
+        *,
+        confidence_threshold: float = 0.5,
+        field_thresholds: Optional[Dict[str, float]] = None,
+        training_id: Optional[str] = None,
+        preprocess_config: Optional[dict] = None,
+        postprocess_config: Optional[dict] = None,
+    ) -> Dict:
+        """Create a prediction with LOW image quality, and create it again with HIGH image quality only if a field
+        was predicted with a confidence below its threshold, or no field was predicted. The latency and number of
+        HIGH quality predictions saved compared to always using HIGH image quality are counted by adaptive_quality.
+
+        >>> from las.client import Client
+        >>> client = Client()
+        >>> prediction = client.create_adaptive_prediction('<document id>', '<model id>', confidence_threshold=0.8)
+        >>> prediction['imageQuality'], client.adaptive_quality.summary()
+
+        :param document_id: Id of the document to run inference and create a prediction on
+        :type document_id: str
+        :param model_id: Id of the model to use for predictions
+        :type model_id: str
+        :param confidence_threshold: Lowest confidence accepted from a LOW quality prediction
+        :type confidence_threshold: float, optional
+        :param field_thresholds: Lowest confidence accepted per label, overriding confidence_threshold
+        :type field_thresholds: Dict [ str, float ], optional
+        :param training_id: Id of training to use for predictions
+        :type training_id: str, optional
+        :param preprocess_config: Preprocessing configuration for prediction, see :py:meth:`create_prediction`. \
+            'imageQuality' is set by this method
+        :type preprocess_config: dict, optional
+        :param postprocess_config: Post processing configuration for prediction, see :py:meth:`create_prediction`
+        :type postprocess_config: dict, optional
+        :return: Prediction response from REST API, with the imageQuality of the prediction that was kept
+        :rtype: dict
+
+        :raises: :py:class:`~las.InvalidCredentialsException`, :py:class:`~las.TooManyRequestsException`,\
+ :py:class:`~las.LimitExceededException`, :py:class:`requests.exception.RequestException`
+        """
+        def predict(image_quality):
+            start = time.monotonic()
+            prediction = self.create_prediction(
+                document_id,
+                model_id,
+                training_id=training_id,
+                preprocess_config={**(preprocess_config or {}), 'imageQuality': image_quality},
+                postprocess_config=postprocess_config,
+            )
+            return {**prediction, 'imageQuality': image_quality}, time.monotonic() - start
+
+        prediction, low_seconds = predict('LOW')
+        low_confidence = low_confidence_fields(prediction, confidence_threshold, field_thresholds)
+        if prediction.get('predictions') and not low_confidence:
+            self.adaptive_quality.record(low_seconds)
+            return prediction
+
+        prediction, high_seconds = predict('HIGH')
+        self.adaptive_quality.record(low_seconds, high_seconds)
+        return prediction
+
+    def create_windowed_prediction(
+        self,
+        document_id: str,
+        model_id: str,
+        page_count: int,
+        *,
+        window_size: int = MAX_PAGES_PER_PREDICTION,
+        stride: Optional[int] = None,
+        n: int = 1,
+        training_id: Optional[str] = None,
+        preprocess_config: Optional[dict] = None,
+        postprocess_config: Optional[dict] = None,
+        max_concurrency: int = 4,
+    ) -> Dict:
+        """Create a prediction on all pages of a long document, by running predictions on windows of up to 3 pages
+        concurrently and merging their field predictions, keeping the n most confident predictions of each label.
+
+        >>> from las.client import Client
+        >>> client = Client()
+        >>> prediction = client.create_windowed_prediction('<document id>', '<model id>', page_count=40)
+        >>> for field in prediction['predictions']:
+        ...     print(field['label'], field['value'], field['confidence'], field['pages'])
+
+        :param document_id: Id of the document to run inference and create a prediction on
+        :type document_id: str
+        :param model_id: Id of the model to use for predictions
+        :type model_id: str
+        :param page_count: Number of pages of the document
+        :type page_count: int
+        :param window_size: Number of pages per prediction, at most 3
+        :type window_size: int, optional
+        :param stride: Number of pages between the first pages of consecutive windows, defaults to window_size. \
+            A stride smaller than window_size makes windows overlap, for fields that span two pages
+        :type stride: int, optional
+        :param n: Number of predictions to keep per label
+        :type n: int, optional
+        :param training_id: Id of training to use for predictions
+        :type training_id: str, optional
+        :param preprocess_config: Preprocessing configuration for each window, see :py:meth:`create_prediction`. \
+            'pages' and 'maxPages' are set by the window
+        :type preprocess_config: dict, optional
+        :param postprocess_config: Post processing configuration for each window, see :py:meth:`create_prediction`
+        :type postprocess_config: dict, optional
+        :param max_concurrency: Maximum number of window predictions in flight
+        :type max_concurrency: int, optional
+        :return: Merged predictions, with the pages and predictionId each field came from, the pages, \
+            predictionId and elapsedTime of each window, and the elapsedTime of the whole prediction in seconds
+        :rtype: dict
+
+        :raises: :py:class:`~las.InvalidCredentialsException`, :py:class:`~las.TooManyRequestsException`,\
+ :py:class:`~las.LimitExceededException`, :py:class:`requests.exception.RequestException`
+        """
+        if page_count < 1:
+            raise ValueError('page_count must be positive')
+
+        start = time.monotonic()
+        windows = page_windows(page_count, window_size, stride or 0)
+        window_config = {k: v for k, v in (preprocess_config or {}).items() if k not in ('pages', 'maxPages')}
+
+        def predict(pages):
+            window_start = time.monotonic()
+            prediction = self.create_prediction(
+                document_id,
+                model_id,
+                training_id=training_id,
+                preprocess_config={**window_config, 'pages': pages},
+                postprocess_config=postprocess_config,
+            )
+            return prediction, time.monotonic() - window_start
+
+        with ThreadPoolExecutor(max_concurrency) as executor:
+            results = [
+                result.unwrap() for result in run_concurrently(
+                    lambda pages: executor.submit(predict, pages),
+                    windows,
+                    max_pending=max_concurrency,
+                )
+            ]
+
+        return {
+            'documentId': document_id,
+            'modelId': model_id,
+            'predictions': merge_predictions(zip(windows, (prediction for prediction, _ in results)), n=n),
+            'windows': [
+                {'pages': pages, 'predictionId': prediction.get('predictionId'), 'elapsedTime': elapsed}
+                for pages, (prediction, elapsed) in zip(windows, results)
+            ],
+            'elapsedTime': time.monotonic() - start,
+        }
 
     def list_predictions(
         self,
@@ -1630,6 +2470,223 @@ class Client:
         }
         return self._make_request(requests.get, '/predictions', params=dictstrip(params))
 
+    def sync_predictions(self, *, model_id: Optional[str] = None, max_results: Optional[int] = None) -> List[Dict]:
+        """Fetch the predictions created since the last sync into the prediction store, and return all predictions
+        known to the store. Pages of :py:meth:`list_predictions` are fetched newest first, until a page reaches
+        predictions created before the last sync.
+
+        >>> from las import Client, PredictionStore
+        >>> client = Client(prediction_store=PredictionStore('predictions.db'))
+        >>> predictions = client.sync_predictions(model_id='<model id>')
+
+        :param model_id: Model ID of predictions
+        :type model_id: str, optional
+        :param max_results: Maximum number of results to be returned per page
+        :type max_results: int, optional
+        :return: Predictions as listed by :py:meth:`list_predictions`, most recently created first
+        :rtype: list
+
+        :raises: :py:class:`ValueError` if the client has no prediction store, \
+ :py:class:`~las.InvalidCredentialsException`, :py:class:`~las.TooManyRequestsException`,\
+ :py:class:`~las.LimitExceededException`, :py:class:`requests.exception.RequestException`
+        """
+        store = self.prediction_store
+        if not store:
+            raise ValueError('sync_predictions requires a client with a prediction_store')
+
+        watermark = store.watermark(model_id)
+        newest, next_token = watermark, None
+        while True:
+            response = self.list_predictions(
+                max_results=max_results,
+                next_token=next_token,
+                order='descending',
+                sort_by='createdTime',
+                model_id=model_id,
+            )
+            predictions = response['predictions']
+            new = [
+                prediction for prediction in predictions
+                if watermark is None or prediction['createdTime'] > watermark
+                or (prediction['createdTime'] == watermark and not store.knows_listed(prediction['predictionId']))
+            ]
+            store.put_listed(new)
+            newest = max([newest or '', *(prediction['createdTime'] for prediction in new)]) or None
+            next_token = response.get('nextToken')
+            # Predictions are listed newest first, so the rest were seen by the last sync
+            if not next_token or watermark and any(prediction['createdTime'] < watermark for prediction in predictions):
+                break
+
+        if newest:
+            store.set_watermark(newest, model_id)
+        return store.listed(model_id)
+
+    def _iter_document_ids(self, **list_documents_args) -> Iterator[str]:
+        next_token = None
+        while True:
+            response = self.list_documents(**list_documents_args, next_token=next_token)
+            for document in response['documents']:
+                yield document['documentId']
+            next_token = response.get('nextToken')
+            if not next_token:
+                return
+
+    def create_predictions(
+        self,
+        model_id: str,
+        document_ids: Optional[Iterable[str]] = None,
+        *,
+        consent_id: Optional[Queryparam] = None,
+        dataset_id: Optional[Queryparam] = None,
+        training_id: Optional[str] = None,
+        preprocess_config: Optional[dict] = None,
+        postprocess_config: Optional[dict] = None,
+        run_async: Optional[bool] = None,
+        idempotency_key_fn: Optional[Callable[[str], str]] = None,
+        max_concurrency: int = 8,
+        ordered: bool = False,
+    ) -> Iterator[BulkResult]:
+        """Create predictions on many documents concurrently, calls the POST /predictions endpoint once per document.
+
+        Documents are either given by id or found by calling :py:meth:`list_documents` with the given filters.
+        Requests are subject to the rate limit of the client, and failures are captured per document instead
+        of aborting the remaining predictions.
+
+        >>> from las.client import Client
+        >>> client = Client(max_requests_per_second=10)
+        >>> for result in client.create_predictions('<model id>', dataset_id='<dataset id>'):
+        ...     print(result.item, result.result if result.ok else result.error)
+
+        :param model_id: Id of the model to use for predictions
+        :type model_id: str
+        :param document_ids: Ids of the documents to create predictions on
+        :type document_ids: Iterable [ str ], optional
+        :param consent_id: Predict on documents with these consent ids, used when document_ids is omitted
+        :type consent_id: Queryparam, optional
+        :param dataset_id: Predict on documents in these datasets, used when document_ids is omitted
+        :type dataset_id: Queryparam, optional
+        :param training_id: Id of training to use for predictions
+        :type training_id: str, optional
+        :param preprocess_config: Preprocessing configuration for prediction, see :py:meth:`create_prediction`
+        :type preprocess_config: dict, optional
+        :param postprocess_config: Post processing configuration for prediction, see :py:meth:`create_prediction`
+        :type postprocess_config: dict, optional
+        :param run_async: If True run the predictions async, if False run sync. if omitted run synchronously.
+        :type run_async: bool, optional
+        :param idempotency_key_fn: Function from document id to idempotency key, used to safely resubmit \
+            predictions of a batch that was interrupted
+        :type idempotency_key_fn: Callable [ [ str ], str ], optional
+        :param max_concurrency: Maximum number of predictions in flight
+        :type max_concurrency: int, optional
+        :param ordered: Yield results in input order if True, in completion order if False
+        :type ordered: bool, optional
+        :return: Iterator of results, one per document, with the document id as item
+        :rtype: Iterator [ :py:class:`~las.BulkResult` ]
+        """
+        if document_ids is None:
+            document_ids = self._iter_document_ids(consent_id=consent_id, dataset_id=dataset_id)
+
+        prediction_args = {
+            'model_id': model_id,
+            'training_id': training_id,
+            'preprocess_config': preprocess_config,
+            'postprocess_config': postprocess_config,
+            'run_async': run_async,
+        }
+
+        def submit(document_id):
+            key = idempotency_key_fn(document_id) if idempotency_key_fn else None
+            create_prediction = self._queued('create prediction', self.create_prediction)
+            return executor.submit(create_prediction, document_id, idempotency_key=key, **prediction_args)
+
+        with ThreadPoolExecutor(max_concurrency) as executor:
+            yield from run_concurrently(
+                submit,
+                document_ids,
+                max_pending=2 * max_concurrency,
+                ordered=ordered,
+            )
+
+    def map(
+        self,
+        fn: Union[str, Callable[..., Any]],
+        kwargs_iterable: Iterable[Mapping[str, Any]],
+        *,
+        max_concurrency: int = 8,
+        ordered: bool = True,
+        progress: Optional[Callable[[int, int], None]] = None,
+        cancel: Optional[threading.Event] = None,
+    ) -> Iterator[BulkResult]:
+        """Call a method of the client, or any callable, once per set of keyword arguments, concurrently.
+
+        Calls share the rate limiter, retry budget and stats of the client, and failures are captured per item
+        instead of aborting the remaining calls. Items are drawn lazily from kwargs_iterable, so it may be a
+        generator of any length. Closing the returned iterator cancels the calls that have not started.
+
+        >>> from las.client import Client
+        >>> client = Client(max_requests_per_second=10)
+        >>> kwargs = ({'document_id': document_id} for document_id in document_ids)
+        >>> for result in client.map('get_document', kwargs, progress=lambda done, failed: print(done, failed)):
+        ...     print(result.item['document_id'], result.result if result.ok else result.error)
+
+        :param fn: Name of a public method of the client, or a callable
+        :type fn: Union [ str, Callable ]
+        :param kwargs_iterable: Keyword arguments of each call
+        :type kwargs_iterable: Iterable [ Mapping [ str, Any ] ]
+        :param max_concurrency: Maximum number of calls in flight
+        :type max_concurrency: int, optional
+        :param ordered: Yield results in input order if True, in completion order if False
+        :type ordered: bool, optional
+        :param progress: Called with the number of completed and failed calls each time a call completes, \
+            from the thread that made the call
+        :type progress: Callable [ [ int, int ], None ], optional
+        :param cancel: When set, no more items are drawn, and calls that have not started fail with \
+            :py:class:`concurrent.futures.CancelledError`
+        :type cancel: threading.Event, optional
+        :return: Iterator of results, one per call, with the keyword arguments as item
+        :rtype: Iterator [ :py:class:`~las.BulkResult` ]
+
+        :raises: :py:class:`ValueError` if fn names a private or missing method of the client
+        """
+        if isinstance(fn, str):
+            if fn.startswith('_') or not callable(getattr(self, fn, None)):
+                raise ValueError(f'{fn} is not a public method of {type(self).__name__}')
+            name, fn = fn, getattr(self, fn)
+        else:
+            name = getattr(fn, '__name__', 'call')
+
+        counts = {'completed': 0, 'failed': 0}
+        counts_lock = threading.Lock()
+
+        def call(kwargs):
+            if cancel and cancel.is_set():
+                raise CancelledError()
+            return fn(**kwargs)
+
+        def report(future):
+            if future.cancelled():
+                return
+            with counts_lock:
+                counts['completed'] += 1
+                counts['failed'] += future.exception() is not None
+                completed, failed = counts['completed'], counts['failed']
+            progress(completed, failed)  # type: ignore
+
+        def submit(kwargs):
+            future = executor.submit(self._queued(name, call), kwargs)
+            if progress:
+                future.add_done_callback(report)
+            return future
+
+        def items():
+            for kwargs in kwargs_iterable:
+                if cancel and cancel.is_set():
+                    return
+                yield kwargs
+
+        with ThreadPoolExecutor(max_concurrency) as executor:
+            yield from run_concurrently(submit, items(), max_pending=2 * max_concurrency, ordered=ordered)
+
     def get_prediction(self, prediction_id: str) -> Dict:
         """Get prediction, calls the GET /predictions/{predictionId} endpoint.
 
@@ -1639,13 +2696,24 @@ class Client:
 
         :param prediction_id: Id of the prediction
         :type prediction_id: str
-        :return: Asset response from REST API with content
+        :return: Asset response from REST API with content. With a prediction store, a prediction that was \
+            created or fetched before is returned from the store
         :rtype: dict
 
         :raises: :py:class:`~las.InvalidCredentialsException`, :py:class:`~las.TooManyRequestsException`,\
  :py:class:`~las.LimitExceededException`, :py:class:`requests.exception.RequestException`
         """
-        return self._make_request(requests.get, f'/predictions/{prediction_id}')
+        store = self.prediction_store
+        if store:
+            stored = store.get(prediction_id)
+            if stored is not None:
+                return stored
+
+        prediction = self._make_request(requests.get, f'/predictions/{prediction_id}')
+        # Asynchronous predictions are stored once their result is available
+        if store and prediction.get('predictions') is not None:
+            store.put(prediction)
+        return prediction
 
     def get_plan(self, plan_id: str) -> Dict:
         """Get information about a specific plan, calls the GET /plans/{plan_id} endpoint.
@@ -2442,7 +3510,7 @@ class Client:
         """
         return self._make_request(requests.delete, f'/workflows/{workflow_id}')
 
-    def execute_workflow(self, workflow_id: str, content: dict) -> Dict:
+    def execute_workflow(self, workflow_id: str, content: dict, *, idempotency_key: Optional[str] = None) -> Dict:
         """Start a workflow execution, calls the POST /workflows/{workflowId}/executions endpoint.
 
         >>> from las.client import Client
@@ -2455,6 +3523,8 @@ class Client:
         :type workflow_id: str
         :param content: Input to the first step of the workflow
         :type content: dict
+        :param idempotency_key: Key that identifies this execution when resubmitting it, generated if omitted
+        :type idempotency_key: str, optional
         :return: Workflow execution response from REST API
         :rtype: dict
 
@@ -2462,7 +3532,7 @@ class Client:
  :py:class:`~las.LimitExceededException`, :py:class:`requests.exception.RequestException`
         """
         endpoint = f'/workflows/{workflow_id}/executions'
-        return self._make_request(requests.post, endpoint, body={'input': content})
+        return self._make_request(requests.post, endpoint, body={'input': content}, idempotency_key=idempotency_key)
 
     def list_workflow_executions(
         self,
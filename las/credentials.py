@@ -2,6 +2,8 @@ import configparser
 import json
 import logging
 import os
+import tempfile
+import threading
 import time
 from os.path import exists, expanduser
 from pathlib import Path
@@ -10,9 +12,15 @@ from typing import List, Optional, Tuple
 import requests
 from requests.auth import HTTPBasicAuth
 
+from .timeouts import AUTH_TIMEOUT, DeadlineExceeded, Timeout, bounded, remaining_time
+from .tracing import span
+
 
 NULL_TOKEN = '', 0
 
+# Serializes the read-modify-write of token cache files by the credentials of this process
+_cache_lock = threading.Lock()
+
 
 class MissingCredentials(Exception):
     pass
@@ -20,6 +28,8 @@ class MissingCredentials(Exception):
 
 class Credentials:
     """Used to fetch and store credentials and to generate/cache an access token.
+    Credentials are thread-safe: when the access token expires, one thread fetches a new token while the other
+    threads wait for it.
 
     :param client_id: The client id
     :type str:
@@ -28,7 +38,9 @@ class Credentials:
     :param auth_endpoint: The auth endpoint
     :type str:
     :param api_endpoint: The api endpoint
-    :type str:"""
+    :type str:
+    :param timeout: Connect and read timeouts for requests to the auth endpoint
+    :type Timeout:"""
 
     def __init__(
         self,
@@ -38,6 +50,8 @@ class Credentials:
         api_endpoint: str,
         cached_profile: str = None,
         cache_path: Path = Path(expanduser('~/.lucidtech/token-cache.json')),
+        *,
+        timeout: Timeout = AUTH_TIMEOUT,
     ):
         if not all([client_id, client_secret, auth_endpoint, api_endpoint]):
             raise MissingCredentials
@@ -49,17 +63,28 @@ class Credentials:
         self.api_endpoint = api_endpoint
         self.cached_profile = cached_profile
         self.cache_path = cache_path
+        self.timeout = Timeout(*timeout)
+        self._lock = threading.Lock()
 
     @property
     def access_token(self) -> str:
         access_token, expiration = self._token
 
         if not access_token or time.time() > expiration:
-            access_token, expiration = self._get_client_credentials()
-            self._token = (access_token, expiration)
-
-            if self.cached_profile:
-                write_token_to_cache(self.cached_profile, self._token, self.cache_path)
+            remaining = remaining_time()
+            if not self._lock.acquire(timeout=-1 if remaining is None else max(remaining, 0)):
+                raise DeadlineExceeded('Deadline exceeded while waiting for an access token')
+            try:
+                # Another thread may have fetched a token while this thread waited for the lock
+                access_token, expiration = self._token
+                if not access_token or time.time() > expiration:
+                    access_token, expiration = self._get_client_credentials()
+                    self._token = (access_token, expiration)
+
+                    if self.cached_profile:
+                        write_token_to_cache(self.cached_profile, self._token, self.cache_path)
+            finally:
+                self._lock.release()
 
         return access_token
 
@@ -68,12 +93,24 @@ class Credentials:
         headers = {'Content-Type': 'application/x-www-form-urlencoded'}
         auth = HTTPBasicAuth(self.client_id, self.client_secret)
 
-        response = requests.post(url, headers=headers, auth=auth)
+        with span('las.token', **{'server.address': self.auth_endpoint}) as token_span:
+            response = requests.post(url, headers=headers, auth=auth, timeout=bounded(self.timeout))
+            token_span.set_attribute('http.response.status_code', response.status_code)
         response.raise_for_status()
 
         response_data = response.json()
         return response_data['access_token'], time.time() + response_data['expires_in']
 
+    def __getstate__(self) -> dict:
+        # Locks can not be pickled, so that credentials can be passed to other processes
+        state = self.__dict__.copy()
+        del state['_lock']
+        return state
+
+    def __setstate__(self, state: dict) -> None:
+        self.__dict__.update(state)
+        self._lock = threading.Lock()
+
 
 def read_token_from_cache(cached_profile: str, cache_path: Path):
     if not cache_path.exists():
@@ -89,19 +126,28 @@ def read_token_from_cache(cached_profile: str, cache_path: Path):
 
 
 def write_token_to_cache(cached_profile, token, cache_path: Path):
-    if not cache_path.exists():
-        cache_path.parent.mkdir(parents=True, exist_ok=True)
-        cache = {}
-    else:
-        cache = json.loads(cache_path.read_text())
-
-    access_token, expires_in = token
-    cache[cached_profile] = {
-        'access_token': access_token,
-        'expires_in': expires_in,
-    }
-
-    cache_path.write_text(json.dumps(cache, indent=2))
+    with _cache_lock:
+        if not cache_path.exists():
+            cache_path.parent.mkdir(parents=True, exist_ok=True)
+            cache = {}
+        else:
+            cache = json.loads(cache_path.read_text())
+
+        access_token, expires_in = token
+        cache[cached_profile] = {
+            'access_token': access_token,
+            'expires_in': expires_in,
+        }
+
+        # Replace the cache file atomically, so that readers never see a partially written cache
+        fd, tmp_path = tempfile.mkstemp(dir=cache_path.parent, prefix=f'.{cache_path.name}.')
+        try:
+            with os.fdopen(fd, 'w') as tmp_file:
+                tmp_file.write(json.dumps(cache, indent=2))
+            os.replace(tmp_path, cache_path)
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
 
 
 def read_from_environ() -> List[Optional[str]]:
@@ -0,0 +1,135 @@
+import socket
+import time
+from contextvars import ContextVar
+from typing import Any, List, NamedTuple, Optional, Tuple
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.connection import HTTPConnection, HTTPSConnection
+from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
+from urllib3.exceptions import NewConnectionError
+from urllib3.util.connection import allowed_gai_family
+
+PHASES = ('dns', 'connect', 'tls', 'send', 'ttfb', 'transfer')
+
+
+class Phase(NamedTuple):
+    """A phase of an HTTP attempt, with start and end as :py:func:`time.perf_counter` values.
+
+    :param name: One of dns, connect, tls, send, ttfb and transfer
+    :type name: str
+    :param start: Start of the phase
+    :type start: float
+    :param end: End of the phase
+    :type end: float"""
+    name: str
+    start: float
+    end: float
+
+    @property
+    def duration(self) -> float:
+        return self.end - self.start
+
+
+_phases: ContextVar[Optional[List[Phase]]] = ContextVar('phases', default=None)
+
+
+def _record(name: str, start: float, end: float) -> None:
+    phases = _phases.get()
+    if phases is not None:
+        phases.append(Phase(name, start, end))
+
+
+class _TimedConnection:
+    """Times the phases of a connection of urllib3. DNS is resolved separately from the TCP connect, by connecting
+    to each resolved address in turn like urllib3 does."""
+    _dns_host: str
+    port: int
+
+    def _new_conn(self) -> socket.socket:
+        host = self._dns_host
+        start = time.perf_counter()
+        try:
+            addresses = socket.getaddrinfo(host, self.port, allowed_gai_family(), socket.SOCK_STREAM)
+        except socket.gaierror:
+            # Let urllib3 resolve again and raise its usual error
+            return super()._new_conn()  # type: ignore
+        resolved = time.perf_counter()
+        _record('dns', start, resolved)
+
+        error: Optional[Exception] = None
+        try:
+            for *_, address in addresses:
+                self._dns_host = str(address[0])
+                try:
+                    sock = super()._new_conn()  # type: ignore
+                except NewConnectionError as e:
+                    error = e
+                    continue
+                _record('connect', resolved, time.perf_counter())
+                return sock
+            raise error  # type: ignore
+        finally:
+            self._dns_host = host
+
+    def connect(self) -> None:
+        super().connect()  # type: ignore
+        phases = _phases.get()
+        if phases and phases[-1].name == 'connect' and isinstance(self, HTTPSConnection):
+            _record('tls', phases[-1].end, time.perf_counter())
+
+    def request(self, *args: Any, **kwargs: Any) -> None:
+        start = time.perf_counter()
+        super().request(*args, **kwargs)  # type: ignore
+        phases = _phases.get()
+        if phases:
+            # Plain HTTP connections connect while sending the request
+            start = max(start, phases[-1].end)
+        _record('send', start, time.perf_counter())
+
+    def getresponse(self, *args: Any, **kwargs: Any) -> Any:
+        start = time.perf_counter()
+        response = super().getresponse(*args, **kwargs)  # type: ignore
+        _record('ttfb', start, time.perf_counter())
+        return response
+
+
+class _TimedHTTPConnection(_TimedConnection, HTTPConnection):
+    pass
+
+
+class _TimedHTTPSConnection(_TimedConnection, HTTPSConnection):
+    pass
+
+
+class _TimedHTTPConnectionPool(HTTPConnectionPool):
+    ConnectionCls = _TimedHTTPConnection
+
+
+class _TimedHTTPSConnectionPool(HTTPSConnectionPool):
+    ConnectionCls = _TimedHTTPSConnection
+
+
+class _TimedAdapter(HTTPAdapter):
+    def init_poolmanager(self, *args, **kwargs):
+        super().init_poolmanager(*args, **kwargs)
+        self.poolmanager.pool_classes_by_scheme = {'http': _TimedHTTPConnectionPool, 'https': _TimedHTTPSConnectionPool}
+
+
+def request_with_phases(method: str, url: str, **kwargs: Any) -> Tuple[requests.Response, List[Phase]]:
+    """Make a request like :py:func:`requests.request`, and return the response with the time spent resolving
+    the host, connecting, in the TLS handshake, sending the request, waiting for the first byte of the response
+    and transferring the response body."""
+    phases: List[Phase] = []
+    token = _phases.set(phases)
+    try:
+        with requests.Session() as session:
+            session.mount('http://', _TimedAdapter())
+            session.mount('https://', _TimedAdapter())
+            response = session.request(method, url, **kwargs)
+    finally:
+        _phases.reset(token)
+
+    if phases and phases[-1].name == 'ttfb':
+        phases.append(Phase('transfer', phases[-1].end, time.perf_counter()))
+    return response, phases
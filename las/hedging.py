@@ -0,0 +1,164 @@
+import contextvars
+import queue
+import threading
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, Future, wait
+from typing import Any, Callable, Deque, Dict, Optional, Tuple
+
+from .retry import RetryBudget
+
+
+class HedgePolicy:
+    """Sends a second, identical GET request when the first has not answered within a delay taken from
+    a percentile of recent latencies, and returns whichever response arrives first. Hedging is limited by
+    a budget shared by all requests of a client, so that it can never double the load on the API.
+
+    Latencies are tracked separately for requests to the API and to the file server. Until min_samples
+    latencies have been observed, requests are not hedged.
+
+    The number of hedged requests is available as hedged, and the number of times the hedge answered
+    before the original request as wins.
+
+    :param percentile: Percentile of recent latencies to wait before hedging
+    :type percentile: float
+    :param min_delay: Never hedge sooner than this number of seconds
+    :type min_delay: float
+    :param max_delay: Never wait longer than this number of seconds before hedging
+    :type max_delay: float, optional
+    :param window: Number of recent latencies to compute the percentile from
+    :type window: int
+    :param min_samples: Number of latencies to observe before hedging
+    :type min_samples: int
+    :param budget: Token bucket that caps hedges to a fraction of requests, defaults to one hedge per ten requests
+    :type budget: :py:class:`~las.RetryBudget`, optional"""
+
+    def __init__(
+        self,
+        percentile: float = 95.0,
+        min_delay: float = 0.01,
+        max_delay: Optional[float] = None,
+        window: int = 1000,
+        min_samples: int = 20,
+        budget: Optional[RetryBudget] = None,
+    ):
+        if not 0 < percentile <= 100:
+            raise ValueError('percentile must be in (0, 100]')
+        self.percentile = percentile
+        self.min_delay = min_delay
+        self.max_delay = max_delay
+        self.window = window
+        self.min_samples = min_samples
+        self.budget = budget or RetryBudget(ratio=0.1, capacity=10)
+        self.hedged = 0
+        self.wins = 0
+        self._latencies: Dict[str, Deque[float]] = {}
+        self._lock = threading.Lock()
+        self._threads = _ThreadCache()
+
+    def observe(self, key: str, seconds: float) -> None:
+        with self._lock:
+            latencies = self._latencies.setdefault(key, deque(maxlen=self.window))
+            latencies.append(seconds)
+
+    def delay(self, key: str) -> Optional[float]:
+        """Number of seconds to wait before hedging a request, None if too few latencies have been observed."""
+        with self._lock:
+            latencies = sorted(self._latencies.get(key, ()))
+        if len(latencies) < max(self.min_samples, 1):
+            return None
+        delay = latencies[round(self.percentile / 100 * (len(latencies) - 1))]
+        delay = max(delay, self.min_delay)
+        return min(delay, self.max_delay) if self.max_delay is not None else delay
+
+    def send(self, key: str, send: Callable[[], Any]) -> Any:
+        """Call send, and call it once more concurrently if it has not returned within the hedge delay.
+        The request that loses is not interrupted, but its result is ignored."""
+        delay = self.delay(key)
+        if delay is None:
+            return self._timed(key, send)
+
+        self.budget.deposit()
+        primary = self._threads.submit(lambda: self._timed(key, send))
+        done, _ = wait([primary], timeout=delay)
+        if done or not self.budget.withdraw():
+            return primary.result()
+
+        with self._lock:
+            self.hedged += 1
+        hedge = self._threads.submit(lambda: self._timed(key, send))
+        pending = {primary, hedge}
+        error: Optional[BaseException] = None
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                if future.exception() is None:
+                    if future is hedge:
+                        with self._lock:
+                            self.wins += 1
+                    return future.result()
+                error = error or future.exception()
+        raise error  # type: ignore
+
+    def _timed(self, key: str, send: Callable[[], Any]) -> Any:
+        start = time.monotonic()
+        result = send()
+        self.observe(key, time.monotonic() - start)
+        return result
+
+    def __getstate__(self) -> dict:
+        # Locks and threads belong to this process, so that clients can be passed to other processes
+        state = self.__dict__.copy()
+        del state['_lock'], state['_threads']
+        return state
+
+    def __setstate__(self, state: dict) -> None:
+        self.__dict__.update(state)
+        self._lock = threading.Lock()
+        self._threads = _ThreadCache()
+
+
+class _ThreadCache:
+    """Runs functions on daemon threads that are reused once idle, so that a thread is not started per request.
+    Unlike a thread pool, a function never waits for a busy thread, and a thread exits after idle_timeout seconds
+    without work. The first attempt can not run on the calling thread, as the caller could then not return
+    the hedge before the first attempt had completed."""
+
+    def __init__(self, idle_timeout: float = 60.0):
+        self.idle_timeout = idle_timeout
+        self.started = 0
+        self._idle = 0
+        self._work: 'queue.SimpleQueue[Tuple[Future, contextvars.Context, Callable[[], Any]]]' = queue.SimpleQueue()
+        self._lock = threading.Lock()
+
+    def submit(self, fn: Callable[[], Any]) -> Future:
+        future: Future = Future()
+        with self._lock:
+            start = not self._idle
+            if start:
+                self.started += 1
+            else:
+                self._idle -= 1
+        self._work.put((future, contextvars.copy_context(), fn))
+        if start:
+            threading.Thread(target=self._run, daemon=True).start()
+        return future
+
+    def _run(self) -> None:
+        while True:
+            try:
+                future, context, fn = self._work.get(timeout=self.idle_timeout)
+            except queue.Empty:
+                with self._lock:
+                    # When no thread is idle, a function was submitted to this thread after the timeout
+                    if self._idle:
+                        self._idle -= 1
+                        return
+                continue
+            try:
+                future.set_result(context.run(fn))
+            except BaseException as e:
+                future.set_exception(e)
+            del future, context, fn
+            with self._lock:
+                self._idle += 1
@@ -0,0 +1,125 @@
+import threading
+from typing import Dict, Iterable, List, Mapping, Optional, Sequence, Tuple
+
+# The API predicts on at most this many pages per prediction
+MAX_PAGES_PER_PREDICTION = 3
+
+
+def page_windows(page_count: int, window_size: int = MAX_PAGES_PER_PREDICTION, stride: int = 0) -> List[List[int]]:
+    """Split the pages of a document into windows of at most window_size pages, starting stride pages apart.
+    By default the windows do not overlap."""
+    if not 1 <= window_size <= MAX_PAGES_PER_PREDICTION:
+        raise ValueError(f'window_size must be between 1 and {MAX_PAGES_PER_PREDICTION}')
+    stride = stride or window_size
+    if not 1 <= stride <= window_size:
+        raise ValueError('stride must be between 1 and window_size')
+
+    windows = []
+    for start in range(0, page_count, stride):
+        windows.append(list(range(start, min(start + window_size, page_count))))
+        if start + window_size >= page_count:
+            break
+    return windows
+
+
+def merge_predictions(windows: Iterable[Tuple[Sequence[int], Dict]], n: int = 1) -> List[Dict]:
+    """Merge the field predictions of several page windows, keeping the n most confident predictions of each label,
+    like the BEST_N_PAGES strategy does for the pages of one prediction. Each kept prediction is annotated with the
+    pages and predictionId of the window it came from. Predictions of the same value on the same page, found by
+    overlapping windows, are kept once."""
+    candidates: Dict[str, List[Dict]] = {}
+    for pages, prediction in windows:
+        for field in prediction.get('predictions') or []:
+            candidates.setdefault(field['label'], []).append({
+                **field,
+                'pages': list(pages),
+                'predictionId': prediction.get('predictionId'),
+            })
+
+    merged = []
+    for fields in candidates.values():
+        fields.sort(key=lambda field: field.get('confidence') or 0, reverse=True)
+        seen = set()
+        kept = []
+        for field in fields:
+            key = (repr(field.get('value')), field.get('page'))
+            if key in seen:
+                continue
+            seen.add(key)
+            kept.append(field)
+            if len(kept) == n:
+                break
+        merged.extend(kept)
+    return merged
+
+
+def low_confidence_fields(
+    prediction: Dict,
+    confidence_threshold: float,
+    field_thresholds: Optional[Mapping[str, float]] = None,
+) -> List[str]:
+    """Labels of the fields of a prediction whose confidence is below the threshold of the label."""
+    field_thresholds = field_thresholds or {}
+    return [
+        field['label'] for field in prediction.get('predictions') or []
+        if field.get('confidence') is not None
+        and field['confidence'] < field_thresholds.get(field['label'], confidence_threshold)
+    ]
+
+
+class AdaptiveQualityStats:
+    """Counts the predictions made by :py:meth:`~las.Client.create_adaptive_prediction` and estimates the latency
+    and cost saved compared to always predicting with HIGH image quality. The latency of a HIGH quality prediction
+    is estimated by the mean latency of the predictions that were escalated."""
+
+    def __init__(self):
+        self.predictions = 0
+        self.escalations = 0
+        self.low_seconds = 0.0
+        self.high_seconds = 0.0
+        self._lock = threading.Lock()
+
+    def record(self, low_seconds: float, high_seconds: Optional[float] = None) -> None:
+        with self._lock:
+            self.predictions += 1
+            self.low_seconds += low_seconds
+            if high_seconds is not None:
+                self.escalations += 1
+                self.high_seconds += high_seconds
+
+    @property
+    def escalation_rate(self) -> float:
+        return self.escalations / self.predictions if self.predictions else 0.0
+
+    @property
+    def saved_seconds(self) -> Optional[float]:
+        """Estimated latency saved in total, None until a prediction has been escalated."""
+        if not self.escalations:
+            return None
+        always_high = self.predictions * self.high_seconds / self.escalations
+        return always_high - self.low_seconds - self.high_seconds
+
+    def saved_cost(self, low_cost: float = 1.0, high_cost: float = 1.0) -> float:
+        """Cost saved in total, given the cost of a prediction with LOW and with HIGH image quality."""
+        return self.predictions * high_cost - self.predictions * low_cost - self.escalations * high_cost
+
+    def summary(self) -> Dict:
+        return {
+            'predictions': self.predictions,
+            'escalations': self.escalations,
+            'escalationRate': self.escalation_rate,
+            'lowSeconds': self.low_seconds,
+            'highSeconds': self.high_seconds,
+            'savedSeconds': self.saved_seconds,
+            'savedHighQualityPredictions': self.predictions - self.escalations,
+        }
+
+    def __getstate__(self) -> dict:
+        # Locks can not be pickled, so that clients can be passed to other processes
+        state = self.__dict__.copy()
+        del state['_lock']
+        return state
+
+    def __setstate__(self, state: dict) -> None:
+        self.__dict__.update(state)
+        self._lock = threading.Lock()
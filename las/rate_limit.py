@@ -0,0 +1,65 @@
+import threading
+import time
+from typing import Optional
+
+from .timeouts import DeadlineExceeded
+
+
+class RateLimiter:
+    """A thread-safe token bucket that limits how many requests are sent per second.
+
+    :param rate: Number of requests allowed per second
+    :type rate: float
+    :param burst: Maximum number of requests that can be sent at once after being idle, defaults to rate
+    :type burst: float, optional"""
+
+    def __init__(self, rate: float, burst: Optional[float] = None):
+        if rate <= 0:
+            raise ValueError('rate must be positive')
+        self.rate = rate
+        self.burst = max(burst or rate, 1)
+        self._tokens = self.burst
+        self._updated = time.monotonic()
+        self._paused_until = 0.0
+        self._lock = threading.Lock()
+
+    def pause(self, seconds: float) -> None:
+        """Hold back all requests for the given number of seconds, e.g. when the server reports that the
+        request budget is exhausted."""
+        with self._lock:
+            self._paused_until = max(self._paused_until, time.monotonic() + seconds)
+
+    def _refill(self, now: float) -> None:
+        self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def acquire(self, timeout: Optional[float] = None) -> float:
+        """Block until a request may be sent and return the number of seconds spent waiting.
+
+        :raises: :py:class:`~las.client.DeadlineExceeded` if the request may not be sent within timeout seconds"""
+        waited = 0.0
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._refill(now)
+                if now < self._paused_until:
+                    delay = self._paused_until - now
+                elif self._tokens >= 1:
+                    self._tokens -= 1
+                    return waited
+                else:
+                    delay = (1 - self._tokens) / self.rate
+            if timeout is not None and waited + delay > timeout:
+                raise DeadlineExceeded('Deadline exceeded while waiting for the rate limiter')
+            time.sleep(delay)
+            waited += delay
+
+    def __getstate__(self) -> dict:
+        # Locks can not be pickled, so that clients can be passed to other processes
+        state = self.__dict__.copy()
+        del state['_lock']
+        return state
+
+    def __setstate__(self, state: dict) -> None:
+        self.__dict__.update(state)
+        self._lock = threading.Lock()
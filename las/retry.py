@@ -0,0 +1,215 @@
+import random
+import threading
+import time
+from email.utils import parsedate_to_datetime
+from typing import Generator, Iterable, Mapping, NamedTuple, Optional
+
+from requests.exceptions import RequestException
+
+# Reset headers larger than this are absolute unix timestamps rather than a number of seconds
+_EPOCH_THRESHOLD = 10 ** 9
+
+
+class RateLimitStatus(NamedTuple):
+    """Request budget reported by the API in the rate limit headers of the most recent response.
+
+    :param limit: Number of requests allowed in the current window
+    :type limit: int, optional
+    :param remaining: Number of requests left in the current window
+    :type remaining: int, optional
+    :param reset_at: Unix time when the window resets
+    :type reset_at: float, optional"""
+    limit: Optional[int]
+    remaining: Optional[int]
+    reset_at: Optional[float]
+
+
+def _header(headers: Mapping[str, str], *names: str) -> Optional[str]:
+    for name in names:
+        value = headers.get(name)
+        if value is not None:
+            return value
+    return None
+
+
+def _to_int(value: Optional[str]) -> Optional[int]:
+    try:
+        return int(float(value))  # type: ignore
+    except (TypeError, ValueError):
+        return None
+
+
+def parse_retry_after(headers: Mapping[str, str]) -> Optional[float]:
+    """Return the number of seconds to wait according to a Retry-After header given either as
+    delay-seconds or as an HTTP date, or None if the header is missing or malformed."""
+    value = headers.get('Retry-After')
+    if value is None:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+def parse_rate_limit(headers: Mapping[str, str]) -> Optional[RateLimitStatus]:
+    """Return the request budget from X-RateLimit-* or RateLimit-* headers, or None if there are none."""
+    limit = _to_int(_header(headers, 'X-RateLimit-Limit', 'RateLimit-Limit'))
+    remaining = _to_int(_header(headers, 'X-RateLimit-Remaining', 'RateLimit-Remaining'))
+    reset = _to_int(_header(headers, 'X-RateLimit-Reset', 'RateLimit-Reset'))
+    if limit is None and remaining is None and reset is None:
+        return None
+    if reset is not None and reset < _EPOCH_THRESHOLD:
+        reset_at: Optional[float] = time.time() + reset
+    else:
+        reset_at = reset
+    return RateLimitStatus(limit, remaining, reset_at)
+
+
+def retry_delay(headers: Mapping[str, str]) -> Optional[float]:
+    """Return how long the server asks us to wait before retrying, taken from Retry-After, or from the
+    rate limit reset time when the remaining budget is exhausted."""
+    retry_after = parse_retry_after(headers)
+    if retry_after is not None:
+        return retry_after
+    status = parse_rate_limit(headers)
+    if status and status.remaining == 0 and status.reset_at is not None:
+        return max(0.0, status.reset_at - time.time())
+    return None
+
+
+def server_hinted_expo(
+    base_delay: float = 1.0,
+    max_delay: Optional[float] = None,
+    jitter: float = 1.0,
+) -> Generator[float, Optional[BaseException], None]:
+    """Wait generator for :py:func:`backoff.on_exception` that sleeps for the delay requested by the server
+    plus up to jitter * base_delay, and falls back to exponential backoff when the failed response carries
+    no hint. The exponential delay is reduced by a random fraction of up to jitter, so jitter=1 gives full
+    jitter. Use together with jitter=None in the decorator."""
+    exception = yield  # type: ignore
+    attempt = 0
+    while True:
+        delay = hinted_delay(exception)
+
+        if delay is None:
+            delay = base_delay * 2 ** attempt
+            delay = delay if max_delay is None else min(delay, max_delay)
+            delay *= 1 - random.uniform(0, jitter)
+        else:
+            delay += random.uniform(0, jitter * base_delay)
+
+        attempt += 1
+        exception = yield delay
+
+
+def hinted_delay(exception: Optional[BaseException]) -> Optional[float]:
+    """Return the delay the server asked for in the response that caused the exception, if any."""
+    delay = getattr(exception, 'retry_after', None)
+    response = getattr(exception, 'response', None)
+    if delay is None and response is not None:
+        delay = retry_delay(response.headers)
+    return delay
+
+
+def status_code(exception: BaseException) -> Optional[int]:
+    """Return the HTTP status code of the response that caused the exception, if any."""
+    code = getattr(exception, 'status_code', None)
+    response = getattr(exception, 'response', None)
+    if code is None and response is not None:
+        code = response.status_code
+    return code
+
+
+class RetryPolicy:
+    """Decides which failed requests are retried and how long to wait between attempts.
+
+    :param max_attempts: Maximum number of attempts per request, including the first one
+    :type max_attempts: int
+    :param base_delay: Delay in seconds before the first retry, doubled for each subsequent retry
+    :type base_delay: float
+    :param max_delay: Upper bound on the delay between attempts. Requests where the server asks for a longer \
+        delay are not retried
+    :type max_delay: float
+    :param jitter: Fraction of the exponential delay that is randomized, 1 gives full jitter
+    :type jitter: float
+    :param retryable_statuses: HTTP status codes that are retried
+    :type retryable_statuses: Iterable [ int ]
+    :param retry_connection_errors: Whether to retry requests that failed without a response, e.g. connection errors
+    :type retry_connection_errors: bool"""
+
+    def __init__(
+        self,
+        max_attempts: int = 4,
+        base_delay: float = 1.0,
+        max_delay: float = 30.0,
+        jitter: float = 1.0,
+        retryable_statuses: Iterable[int] = (429, 500, 502, 503, 504),
+        retry_connection_errors: bool = True,
+    ):
+        if max_attempts < 1:
+            raise ValueError('max_attempts must be at least 1')
+        self.max_attempts = max_attempts
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.jitter = jitter
+        self.retryable_statuses = frozenset(retryable_statuses)
+        self.retry_connection_errors = retry_connection_errors
+
+    def is_retryable(self, exception: BaseException) -> bool:
+        code = status_code(exception)
+        if code is None:
+            return self.retry_connection_errors and isinstance(exception, RequestException)
+        if code not in self.retryable_statuses:
+            return False
+        delay = hinted_delay(exception)
+        return delay is None or delay <= self.max_delay
+
+    def wait_gen(self) -> Generator[float, Optional[BaseException], None]:
+        return server_hinted_expo(self.base_delay, self.max_delay, self.jitter)
+
+
+class RetryBudget:
+    """A thread-safe token bucket that caps retries to a fraction of the traffic, shared by all requests
+    of a client. Every request deposits ratio tokens and every retry withdraws one, so when an upstream
+    incident makes most requests fail, retries stop instead of multiplying the load.
+
+    :param ratio: Number of retries earned per request
+    :type ratio: float
+    :param capacity: Maximum number of tokens, i.e. the number of retries allowed in a burst
+    :type capacity: float"""
+
+    def __init__(self, ratio: float = 0.2, capacity: float = 10):
+        self.ratio = ratio
+        self.capacity = capacity
+        self._tokens = capacity
+        self._lock = threading.Lock()
+
+    @property
+    def tokens(self) -> float:
+        return self._tokens
+
+    def deposit(self) -> None:
+        with self._lock:
+            self._tokens = min(self.capacity, self._tokens + self.ratio)
+
+    def withdraw(self) -> bool:
+        """Take a token for a retry, return False if the budget is exhausted."""
+        with self._lock:
+            if self._tokens < 1:
+                return False
+            self._tokens -= 1
+            return True
+
+    def __getstate__(self) -> dict:
+        # Locks can not be pickled, so that clients can be passed to other processes
+        state = self.__dict__.copy()
+        del state['_lock']
+        return state
+
+    def __setstate__(self, state: dict) -> None:
+        self.__dict__.update(state)
+        self._lock = threading.Lock()
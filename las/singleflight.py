@@ -0,0 +1,58 @@
+import threading
+from concurrent.futures import Future
+from typing import Any, Callable, Dict, Hashable, Optional
+
+
+class SingleFlight:
+    """Coalesces concurrent calls with the same key, so that only the first caller does the work and the callers
+    that arrive while it is in flight wait for it and receive the same result, or its exception. The result is
+    shared by all callers and not copied, as copying a large response costs more than the request it saves, so it
+    must be treated as read-only.
+
+    The number of calls is available as calls, and the number of calls that were served by another caller's
+    request as coalesced."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._in_flight: Dict[Hashable, Future] = {}
+        self.calls = 0
+        self.coalesced = 0
+
+    def do(self, key: Hashable, fn: Callable[[], Any], timeout: Optional[float] = None) -> Any:
+        """Return the result of fn, sharing it with concurrent calls with the same key. Callers that wait for
+        another caller give up after timeout seconds with a :py:class:`concurrent.futures.TimeoutError`."""
+        with self._lock:
+            self.calls += 1
+            in_flight = self._in_flight.get(key)
+            leader = in_flight is None
+            if in_flight is None:
+                future = self._in_flight[key] = Future()
+            else:
+                future = in_flight
+                self.coalesced += 1
+
+        if not leader:
+            return future.result(timeout)
+
+        try:
+            result = fn()
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        else:
+            future.set_result(result)
+            return result
+        finally:
+            with self._lock:
+                del self._in_flight[key]
+
+    def __getstate__(self) -> dict:
+        # Locks and calls in flight belong to this process, so that clients can be passed to other processes
+        state = self.__dict__.copy()
+        del state['_lock'], state['_in_flight']
+        return state
+
+    def __setstate__(self, state: dict) -> None:
+        self.__dict__.update(state)
+        self._lock = threading.Lock()
+        self._in_flight = {}
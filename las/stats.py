@@ -0,0 +1,196 @@
+import copy
+import math
+import threading
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from .diagnostics import PHASES, Phase
+
+# Latencies are counted in buckets that grow by a factor of 2 ** (1 / 8), which bounds the relative error of
+# percentiles to 9 % while a day's worth of latencies fits in less than 250 buckets
+_BUCKETS_PER_DOUBLING = 8
+_MIN_LATENCY = 1e-4
+
+
+def endpoint_template(path: str) -> str:
+    """Replace the ids in an API path with {id}, e.g. /documents/{id} for /documents/las:document:abc.
+    Paths of the API alternate between collections and ids, so every other segment is an id."""
+    segments = path.split('/')
+    return '/'.join('{id}' if position % 2 == 0 and segment else segment for position, segment in enumerate(segments))
+
+
+class LatencyHistogram:
+    """Counts latencies in logarithmic buckets, so that memory stays bounded no matter how many latencies
+    are recorded. Histograms can be merged, e.g. to combine the latencies recorded by several processes."""
+
+    def __init__(self):
+        self.buckets: Dict[int, int] = {}
+        self.count = 0
+        self.sum = 0.0
+        self.max = 0.0
+
+    def record(self, seconds: float) -> None:
+        index = max(0, math.ceil(math.log2(max(seconds, _MIN_LATENCY) / _MIN_LATENCY) * _BUCKETS_PER_DOUBLING))
+        self.buckets[index] = self.buckets.get(index, 0) + 1
+        self.count += 1
+        self.sum += seconds
+        self.max = max(self.max, seconds)
+
+    def merge(self, other: 'LatencyHistogram') -> None:
+        for index, count in other.buckets.items():
+            self.buckets[index] = self.buckets.get(index, 0) + count
+        self.count += other.count
+        self.sum += other.sum
+        self.max = max(self.max, other.max)
+
+    def quantile(self, q: float) -> Optional[float]:
+        """Upper bound of the bucket holding the q-quantile, None if no latencies have been recorded."""
+        if not self.count:
+            return None
+        rank = max(1, math.ceil(q * self.count))
+        seen = 0
+        for index in sorted(self.buckets):
+            seen += self.buckets[index]
+            if seen >= rank:
+                return min(_MIN_LATENCY * 2 ** (index / _BUCKETS_PER_DOUBLING), self.max)
+        return self.max
+
+
+class EndpointStats:
+    """Latencies, errors and retries of the calls to one endpoint. Latencies are in seconds and include retries.
+    With connection diagnostics, the durations of the phases of each HTTP attempt are kept in phases."""
+
+    def __init__(self):
+        self.latencies = LatencyHistogram()
+        self.errors = 0
+        self.retries = 0
+        self.phases: Dict[str, LatencyHistogram] = {}
+
+    @property
+    def count(self) -> int:
+        return self.latencies.count
+
+    @property
+    def error_rate(self) -> float:
+        return self.errors / self.count if self.count else 0.0
+
+    @property
+    def mean(self) -> Optional[float]:
+        return self.latencies.sum / self.count if self.count else None
+
+    @property
+    def p50(self) -> Optional[float]:
+        return self.latencies.quantile(0.5)
+
+    @property
+    def p90(self) -> Optional[float]:
+        return self.latencies.quantile(0.9)
+
+    @property
+    def p99(self) -> Optional[float]:
+        return self.latencies.quantile(0.99)
+
+    @property
+    def max(self) -> float:
+        return self.latencies.max
+
+    def merge(self, other: 'EndpointStats') -> None:
+        self.latencies.merge(other.latencies)
+        self.errors += other.errors
+        self.retries += other.retries
+        for phase, histogram in other.phases.items():
+            self.phases.setdefault(phase, LatencyHistogram()).merge(histogram)
+
+    def summary(self) -> Dict:
+        phases = {
+            phase: {'p50': histogram.quantile(0.5), 'p99': histogram.quantile(0.99), 'max': histogram.max}
+            for phase, histogram in self.phases.items()
+        }
+        return {
+            'count': self.count,
+            'errors': self.errors,
+            'errorRate': self.error_rate,
+            'retries': self.retries,
+            'mean': self.mean,
+            'p50': self.p50,
+            'p90': self.p90,
+            'p99': self.p99,
+            'max': self.max,
+            **({'phases': phases} if phases else {}),
+        }
+
+
+class Stats(Dict[str, EndpointStats]):
+    """Statistics per endpoint, keyed by method and endpoint template, e.g. GET /documents/{id}.
+    Stats are plain picklable objects, so the stats of several clients, threads or processes can be merged."""
+
+    def merge(self, other: 'Stats') -> 'Stats':
+        for endpoint, endpoint_stats in other.items():
+            self.setdefault(endpoint, EndpointStats()).merge(endpoint_stats)
+        return self
+
+    def summary(self) -> Dict[str, Dict]:
+        return {endpoint: endpoint_stats.summary() for endpoint, endpoint_stats in sorted(self.items())}
+
+    def report(self) -> str:
+        """A table of the p50 and p99 latencies in milliseconds of each endpoint, and of the phases of its
+        HTTP attempts when connection diagnostics are enabled."""
+        rows: List[Tuple[str, ...]] = [('endpoint', 'phase', 'count', 'p50 ms', 'p99 ms', 'max ms')]
+        for endpoint, endpoint_stats in sorted(self.items()):
+            histograms = [('total', endpoint_stats.latencies)]
+            histograms += [(phase, endpoint_stats.phases[phase]) for phase in PHASES if phase in endpoint_stats.phases]
+            for phase, histogram in histograms:
+                rows.append((
+                    endpoint,
+                    phase,
+                    str(histogram.count),
+                    *(f'{1000 * (latency or 0):.1f}' for latency in (
+                        histogram.quantile(0.5), histogram.quantile(0.99), histogram.max,
+                    )),
+                ))
+        widths = [max(len(row[column]) for row in rows) for column in range(len(rows[0]))]
+        return '\n'.join('  '.join(cell.ljust(width) for cell, width in zip(row, widths)).rstrip() for row in rows)
+
+
+class StatsRecorder:
+    """Thread-safe recorder of the stats of a client."""
+
+    def __init__(self):
+        self._stats = Stats()
+        self._lock = threading.Lock()
+
+    def record(self, endpoint: str, seconds: float, error: bool = False, retries: int = 0) -> None:
+        with self._lock:
+            endpoint_stats = self._stats.get(endpoint)
+            if endpoint_stats is None:
+                endpoint_stats = self._stats[endpoint] = EndpointStats()
+            endpoint_stats.latencies.record(seconds)
+            endpoint_stats.errors += error
+            endpoint_stats.retries += retries
+
+    def record_phases(self, endpoint: str, phases: Iterable[Phase]) -> None:
+        with self._lock:
+            endpoint_stats = self._stats.get(endpoint)
+            if endpoint_stats is None:
+                endpoint_stats = self._stats[endpoint] = EndpointStats()
+            for phase in phases:
+                histogram = endpoint_stats.phases.get(phase.name)
+                if histogram is None:
+                    histogram = endpoint_stats.phases[phase.name] = LatencyHistogram()
+                histogram.record(phase.duration)
+
+    def snapshot(self, reset: bool = False) -> Stats:
+        with self._lock:
+            if reset:
+                stats, self._stats = self._stats, Stats()
+                return stats
+            return copy.deepcopy(self._stats)
+
+    def __getstate__(self) -> dict:
+        # Locks can not be pickled, so that clients can be passed to other processes
+        state = self.__dict__.copy()
+        del state['_lock']
+        return state
+
+    def __setstate__(self, state: dict) -> None:
+        self.__dict__.update(state)
+        self._lock = threading.Lock()
@@ -0,0 +1,83 @@
+import io
+import json
+from base64 import b64encode
+from typing import Any, Dict, Union
+
+
+class Base64JSONBody(io.RawIOBase):
+    """A JSON request body where one field holds binary content that is base64 encoded as the body is read.
+
+    Only the part of the content that is being read is encoded at a time, so the memory used does not grow with
+    the size of the content. The body has a known length, so it is sent with Content-Length, and it is seekable,
+    so it can be rewound and sent again when a request is retried.
+
+    :param fields: The other fields of the JSON object
+    :type fields: dict
+    :param key: Name of the field that holds the base64 encoded content
+    :type key: str
+    :param raw: Content to base64 encode
+    :type raw: Union[bytes, bytearray, memoryview, mmap.mmap]"""
+
+    chunk_size = 2 ** 16
+
+    def __init__(self, fields: Dict[str, Any], key: str, raw: Union[bytes, bytearray, memoryview]):
+        super().__init__()
+        head = json.dumps(fields)[:-1]
+        self._prefix = f'{head}{", " if fields else ""}{json.dumps(key)}: "'.encode()
+        self._suffix = b'"}'
+        self._raw = memoryview(raw)
+        self._encoded_length = 4 * -(-len(self._raw) // 3)
+        self._length = len(self._prefix) + self._encoded_length + len(self._suffix)
+        self._position = 0
+
+    def __len__(self) -> int:
+        return self._length
+
+    def readable(self) -> bool:
+        return True
+
+    def seekable(self) -> bool:
+        return True
+
+    def tell(self) -> int:
+        return self._position
+
+    def seek(self, offset: int, whence: int = io.SEEK_SET) -> int:
+        start = {io.SEEK_SET: 0, io.SEEK_CUR: self._position, io.SEEK_END: self._length}[whence]
+        self._position = max(0, start + offset)
+        return self._position
+
+    def _read_at(self, position: int, size: int) -> bytes:
+        if position < len(self._prefix):
+            return self._prefix[position:position + size]
+
+        offset = position - len(self._prefix)
+        if offset < self._encoded_length:
+            group, skip = divmod(offset, 4)
+            groups = -(-(skip + size) // 4)
+            return b64encode(self._raw[group * 3:(group + groups) * 3])[skip:skip + size]
+
+        offset -= self._encoded_length
+        return self._suffix[offset:offset + size]
+
+    def read(self, size: int = -1) -> bytes:
+        if size is None or size < 0:
+            size = self._length - self._position
+
+        chunks = []
+        while size > 0 and self._position < self._length:
+            chunk = self._read_at(self._position, min(size, self.chunk_size))
+            self._position += len(chunk)
+            size -= len(chunk)
+            chunks.append(chunk)
+        return b''.join(chunks)
+
+    def close(self) -> None:
+        # Release the view of the content, so that a memory-mapped file can be closed after the request
+        self._raw.release()
+        super().close()
+
+    def readinto(self, buffer) -> int:
+        data = self.read(len(buffer))
+        buffer[:len(data)] = data
+        return len(data)
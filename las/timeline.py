@@ -0,0 +1,155 @@
+import itertools
+import json
+import os
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Deque, Dict, Iterator, List, NamedTuple, Optional, Union
+
+
+class TimelineEvent(NamedTuple):
+    """A phase of a request, with start and end in seconds from the start of the timeline.
+
+    :param name: Name of the event, e.g. GET /documents/{id}
+    :type name: str
+    :param category: Phase of the request, one of call, queue, rate_limit, http, response, transfer or backoff, \
+        or dns, connect, tls, send and ttfb with connection diagnostics
+    :type category: str
+    :param start: Start of the event
+    :type start: float
+    :param end: End of the event
+    :type end: float
+    :param thread_id: Id of the thread the event happened on
+    :type thread_id: int
+    :param async_id: Set for events that overlap other events of the thread, such as waiting in a queue
+    :type async_id: int, optional
+    :param args: Details of the event, such as the status code
+    :type args: dict"""
+    name: str
+    category: str
+    start: float
+    end: float
+    thread_id: int
+    async_id: Optional[int]
+    args: Dict[str, Any]
+
+
+class Timeline:
+    """Records when each request of a client starts and ends, and the time spent in each phase: waiting in the
+    queue of a bulk operation, waiting for the rate limiter, waiting for the response, transferring the body
+    and backing off before a retry. Events are kept in a ring buffer, so memory stays bounded and the most
+    recent events are kept when a long running job records more than capacity events.
+
+    The timeline can be exported as Chrome trace event JSON, to be viewed in chrome://tracing or Perfetto.
+
+    >>> from las import Client, Timeline
+    >>> client = Client(timeline=Timeline())
+    >>> results = list(client.create_documents(['a.pdf', 'b.pdf'], consent_id='<consent id>'))
+    >>> client.timeline.export('create_documents.json')
+
+    :param capacity: Maximum number of events to keep
+    :type capacity: int"""
+
+    def __init__(self, capacity: int = 100_000):
+        self.events: Deque[TimelineEvent] = deque(maxlen=capacity)
+        self.recorded = 0
+        self._origin = time.perf_counter()
+        self._thread_names: Dict[int, str] = {}
+        self._async_ids = itertools.count()
+        self._lock = threading.Lock()
+
+    @property
+    def dropped(self) -> int:
+        """Number of events that were dropped from the ring buffer to make room for newer events."""
+        return self.recorded - len(self.events)
+
+    def now(self) -> float:
+        return time.perf_counter() - self._origin
+
+    def relative(self, perf_counter: float) -> float:
+        """Time on the timeline of a :py:func:`time.perf_counter` value."""
+        return perf_counter - self._origin
+
+    def record(self, name: str, category: str, start: float, end: float, **args: Any) -> None:
+        """Record an event of the current thread."""
+        self._append(name, category, start, end, None, args)
+
+    def record_async(self, name: str, category: str, start: float, end: float, **args: Any) -> None:
+        """Record an event that may overlap other events of the current thread."""
+        self._append(name, category, start, end, next(self._async_ids), args)
+
+    @contextmanager
+    def span(self, name: str, category: str, **args: Any) -> Iterator[Dict[str, Any]]:
+        """Record the block as an event of the current thread. Details can be added to the yielded args."""
+        start = self.now()
+        try:
+            yield args
+        finally:
+            self.record(name, category, start, self.now(), **args)
+
+    def clear(self) -> None:
+        with self._lock:
+            self.events.clear()
+            self.recorded = 0
+
+    def _append(self, name, category, start, end, async_id, args):
+        thread = threading.current_thread()
+        event = TimelineEvent(name, category, start, end, thread.ident, async_id, args)  # type: ignore
+        with self._lock:
+            self._thread_names.setdefault(thread.ident, thread.name)  # type: ignore
+            self.events.append(event)
+            self.recorded += 1
+
+    def __getstate__(self) -> dict:
+        # Locks and counters can not be pickled, so that clients can be passed to other processes.
+        # Skipping an async id is harmless, as async ids only need to be unique
+        with self._lock:
+            state = self.__dict__.copy()
+            state['events'] = deque(self.events, maxlen=self.events.maxlen)
+            state['_thread_names'] = dict(self._thread_names)
+        del state['_lock']
+        state['_async_ids'] = next(self._async_ids)
+        return state
+
+    def __setstate__(self, state: dict) -> None:
+        self.__dict__.update(state)
+        self._async_ids = itertools.count(state['_async_ids'])
+        self._lock = threading.Lock()
+
+    def to_chrome_trace(self) -> Dict[str, Any]:
+        """Events in the Chrome trace event format, with timestamps in microseconds."""
+        pid = os.getpid()
+        with self._lock:
+            events = list(self.events)
+            thread_names = dict(self._thread_names)
+
+        trace_events: List[Dict[str, Any]] = [
+            {'name': 'thread_name', 'ph': 'M', 'pid': pid, 'tid': tid, 'args': {'name': name}}
+            for tid, name in thread_names.items()
+        ]
+        for event in events:
+            common = {'name': event.name, 'cat': event.category, 'pid': pid, 'tid': event.thread_id}
+            if event.async_id is None:
+                trace_events.append({
+                    **common,
+                    'ph': 'X',
+                    'ts': event.start * 1e6,
+                    'dur': (event.end - event.start) * 1e6,
+                    'args': event.args,
+                })
+            else:
+                trace_events.append({
+                    **common,
+                    'ph': 'b',
+                    'id': event.async_id,
+                    'ts': event.start * 1e6,
+                    'args': event.args,
+                })
+                trace_events.append({**common, 'ph': 'e', 'id': event.async_id, 'ts': event.end * 1e6})
+        return {'traceEvents': trace_events, 'displayTimeUnit': 'ms'}
+
+    def export(self, path: Union[str, Path]) -> None:
+        """Write the events to path as Chrome trace event JSON."""
+        Path(path).write_text(json.dumps(self.to_chrome_trace(), default=str))
@@ -0,0 +1,78 @@
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Callable, Generator, Iterator, NamedTuple, Optional
+
+from requests.exceptions import Timeout as RequestsTimeout
+
+
+class Timeout(NamedTuple):
+    """Connect and read timeouts in seconds for a single HTTP attempt, None means wait forever.
+
+    :param connect: Seconds to wait for the connection to be established
+    :type connect: float, optional
+    :param read: Seconds to wait for the server between bytes of the response
+    :type read: float, optional"""
+    connect: Optional[float]
+    read: Optional[float]
+
+
+API_TIMEOUT = Timeout(connect=10, read=180)
+FILESERVER_TIMEOUT = Timeout(connect=10, read=300)
+AUTH_TIMEOUT = Timeout(connect=10, read=30)
+
+
+class DeadlineExceeded(RequestsTimeout):
+    """A DeadlineExceeded is raised if a call could not complete before the deadline set with
+    :py:meth:`~las.Client.deadline`."""
+    pass
+
+
+_deadline: ContextVar[Optional[float]] = ContextVar('las_deadline', default=None)
+
+
+@contextmanager
+def deadline(seconds: float) -> Iterator[None]:
+    """Context manager that makes every call inside the block, including its retries and backoff sleeps,
+    complete or fail within the given number of seconds from now. Nested deadlines can only shorten it."""
+    current = _deadline.get()
+    new = time.monotonic() + seconds
+    token = _deadline.set(new if current is None else min(current, new))
+    try:
+        yield
+    finally:
+        _deadline.reset(token)
+
+
+def remaining_time() -> Optional[float]:
+    """Return the number of seconds left until the current deadline, or None if there is no deadline."""
+    current = _deadline.get()
+    return None if current is None else current - time.monotonic()
+
+
+def bounded(timeout: Timeout) -> Timeout:
+    """Shorten the timeout so that an attempt does not outlive the current deadline."""
+    remaining = remaining_time()
+    if remaining is None:
+        return timeout
+    if remaining <= 0:
+        raise DeadlineExceeded('Deadline exceeded')
+    return Timeout(*(remaining if t is None else min(t, remaining) for t in timeout))
+
+
+def bounded_wait_gen(
+    wait_gen: Callable[[], Generator[float, Optional[BaseException], None]],
+) -> Callable[[], Generator[float, Optional[BaseException], None]]:
+    """Wrap a wait generator for :py:func:`backoff.on_exception` so that it stops, and the last error is raised,
+    when the backoff sleep would not end before the current deadline. Backoff's own max_time is counted from the
+    start of the failed attempt, so it lets the sleep run past the deadline by the duration of the attempt."""
+    def bounded_wait():
+        waits = wait_gen()
+        exception = yield next(waits)  # type: ignore
+        while True:
+            delay = waits.send(exception)
+            remaining = remaining_time()
+            if remaining is not None and delay >= remaining:
+                return
+            exception = yield delay
+    return bounded_wait
@@ -0,0 +1,104 @@
+import functools
+import inspect
+import time
+from typing import Any, Callable, ContextManager, Mapping, Optional
+
+from .__version__ import __version__
+
+# Spans are exported by the tracer provider configured by the application. Without opentelemetry-api installed,
+# spans are a shared no-op object and methods are left undecorated
+try:
+    from opentelemetry import trace
+except ImportError:
+    trace = None  # type: ignore
+
+_tracer = trace.get_tracer('las', __version__) if trace else None
+
+
+class _NoopSpan:
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        return False
+
+    def set_attribute(self, key: str, value: Any) -> None:
+        pass
+
+
+_NOOP_SPAN = _NoopSpan()
+
+
+def span(name: str, **attributes: Any) -> ContextManager:
+    """Start a span that is the current span until the block exits. Attributes that are None are left out."""
+    if _tracer is None:
+        return _NOOP_SPAN
+    return _tracer.start_as_current_span(name, attributes={k: v for k, v in attributes.items() if v is not None})
+
+
+def http_span(name: str, method: str, host: Optional[str], template: Optional[str] = None) -> ContextManager:
+    """Start a span for one HTTP attempt, named after the method and endpoint, e.g. GET /documents/{id}."""
+    return span(name, **{'http.request.method': method, 'server.address': host, 'url.template': template})
+
+
+def record_span(name: str, start: float, end: float, **attributes: Any) -> None:
+    """Record a span that has already ended, e.g. a wait, with start and end given as unix time in seconds."""
+    if _tracer is None:
+        return
+    attributes = {k: v for k, v in attributes.items() if v is not None}
+    _tracer.start_span(name, attributes=attributes, start_time=int(start * 1e9)).end(end_time=int(end * 1e9))
+
+
+def on_backoff(details: Mapping[str, Any]) -> None:
+    """Handler for backoff that records the wait before the next attempt as a span."""
+    now = time.time()
+    exception: Optional[BaseException] = details.get('exception')
+    record_span(
+        'las.backoff',
+        now,
+        now + details['wait'],
+        **{
+            'las.attempt': details['tries'],
+            'las.backoff.wait': details['wait'],
+            'exception.type': type(exception).__name__ if exception else None,
+        },
+    )
+
+
+def traced_methods(cls: type) -> type:
+    """Class decorator that traces every public method of cls with a span named after the class and method."""
+    if _tracer is None:
+        return cls
+
+    for name, method in list(vars(cls).items()):
+        if name.startswith('_') or not inspect.isfunction(method):
+            continue
+        if inspect.isgeneratorfunction(method):
+            setattr(cls, name, _traced_generator(f'{cls.__name__}.{name}', method))
+        else:
+            setattr(cls, name, _traced(f'{cls.__name__}.{name}', method))
+    return cls
+
+
+def _traced(name: str, method: Callable) -> Callable:
+    @functools.wraps(method)
+    def wrapper(*args, **kwargs):
+        with span(name):
+            return method(*args, **kwargs)
+    return wrapper
+
+
+def _traced_generator(name: str, method: Callable) -> Callable:
+    # The span of a generator covers all of its iterations, but cannot be the current span, as the caller
+    # runs other code between iterations
+    @functools.wraps(method)
+    def wrapper(*args, **kwargs):
+        generator_span = _tracer.start_span(name)  # type: ignore
+        try:
+            yield from method(*args, **kwargs)
+        except BaseException as e:
+            generator_span.record_exception(e)
+            raise
+        finally:
+            generator_span.end()
+    return wrapper
@@ -28,6 +28,7 @@ setup(
     url=about['__url__'],
     packages=['las'],
     install_requires=install_requires,
+    extras_require={'tracing': ['opentelemetry-api']},
     platforms='Posix; MacOS X; Windows',
     classifiers=[
         'Development Status :: 5 - Production/Stable',
@@ -1,4 +1,5 @@
 import string
+import time
 from os import urandom
 from random import choice, randint
 
@@ -29,6 +30,27 @@ def client():
     return client
 
 
+@pytest.fixture(scope='module')
+def client_with_access_token(client):
+    _ = client.credentials.access_token
+    return client
+
+
+@pytest.fixture
+def make_client():
+    """Create clients whose access token does not expire during the test, so that no token is fetched"""
+    def make_client(*args, **client_args):
+        client = Client(*args, **client_args)
+        client.credentials._token = ('token', time.time() + 1000)
+        return client
+    return make_client
+
+
+@pytest.fixture
+def no_backoff_sleep(monkeypatch):
+    monkeypatch.setattr('backoff._sync.time.sleep', lambda seconds: None)
+
+
 @pytest.fixture(scope='module')
 def static_client():
     client = Client()
@@ -0,0 +1,77 @@
+import pickle
+
+import pytest
+import requests_mock
+from las.predictions import AdaptiveQualityStats, low_confidence_fields
+
+from . import service
+
+
+def test_low_confidence_fields():
+    prediction = {'predictions': [
+        {'label': 'total', 'value': '10', 'confidence': 0.6},
+        {'label': 'date', 'value': '2020-01-01', 'confidence': 0.9},
+        {'label': 'lines', 'value': []},
+    ]}
+
+    assert low_confidence_fields(prediction, 0.5) == []
+    assert low_confidence_fields(prediction, 0.7) == ['total']
+    assert low_confidence_fields(prediction, 0.5, {'date': 0.95}) == ['date']
+
+
+def test_adaptive_quality_stats():
+    stats = AdaptiveQualityStats()
+    assert stats.saved_seconds is None
+
+    for _ in range(3):
+        stats.record(1.0)
+    stats.record(1.0, 4.0)
+
+    assert stats.escalation_rate == 0.25
+    assert stats.saved_seconds == pytest.approx(4 * 4.0 - 4 * 1.0 - 4.0)
+    assert stats.saved_cost(low_cost=1, high_cost=3) == 4 * 3 - 4 * 1 - 3
+    assert stats.summary()['savedHighQualityPredictions'] == 3
+
+
+def test_adaptive_quality_stats_can_be_pickled():
+    stats = AdaptiveQualityStats()
+    stats.record(1.0, 4.0)
+
+    unpickled = pickle.loads(pickle.dumps(stats))
+    unpickled.record(1.0)
+    assert unpickled.summary()['predictions'] == 2
+    assert unpickled.escalations == 1
+
+
+@pytest.mark.parametrize('confidences,expected_quality', [
+    ({'LOW': 0.9, 'HIGH': 0.95}, 'LOW'),
+    ({'LOW': 0.3, 'HIGH': 0.95}, 'HIGH'),
+    ({'LOW': None, 'HIGH': 0.95}, 'HIGH'),
+])
+def test_create_adaptive_prediction(make_client, confidences, expected_quality):
+    client = make_client()
+    document_id, model_id = service.create_document_id(), service.create_model_id()
+    qualities = []
+
+    def post_prediction(request, context):
+        preprocess_config = request.json()['preprocessConfig']
+        assert preprocess_config['autoRotate'] is True
+        quality = preprocess_config['imageQuality']
+        qualities.append(quality)
+        confidence = confidences[quality]
+        predictions = [] if confidence is None else [{'label': 'total', 'value': '1', 'confidence': confidence}]
+        return {'predictionId': quality, 'predictions': predictions}
+
+    with requests_mock.Mocker() as m:
+        m.post(f'{client.credentials.api_endpoint}/predictions', json=post_prediction)
+        prediction = client.create_adaptive_prediction(
+            document_id,
+            model_id,
+            confidence_threshold=0.8,
+            preprocess_config={'autoRotate': True, 'imageQuality': 'HIGH'},
+        )
+
+    assert prediction['predictionId'] == prediction['imageQuality'] == expected_quality
+    assert qualities == (['LOW'] if expected_quality == 'LOW' else ['LOW', 'HIGH'])
+    assert client.adaptive_quality.predictions == 1
+    assert client.adaptive_quality.escalations == (expected_quality == 'HIGH')
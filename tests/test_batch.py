@@ -0,0 +1,79 @@
+import time
+from concurrent.futures import CancelledError
+from urllib.parse import unquote
+
+import pytest
+import requests_mock
+from las import BatchError
+from las.client import NotFound
+
+from . import service
+
+
+def test_batch(make_client):
+    client = make_client()
+    workflow_id = service.create_workflow_id()
+    execution_ids = [service.create_workflow_execution_id() for _ in range(10)]
+    missing = execution_ids[2:4]
+
+    def delete_execution(request, context):
+        execution_id = unquote(request.path.split('/')[-1])
+        if execution_id in missing:
+            context.status_code = 404
+            return {'message': 'Not found'}
+        time.sleep(0.01)
+        return {'executionId': execution_id}
+
+    with requests_mock.Mocker() as m:
+        m.delete(requests_mock.ANY, json=delete_execution)
+        with client.batch(max_concurrency=4) as batch:
+            futures = [batch.delete_workflow_execution(workflow_id, execution_id) for execution_id in execution_ids]
+            assert m.call_count == 0
+
+    assert m.call_count == 10
+    assert futures[0].result() == {'executionId': execution_ids[0]}
+    assert isinstance(futures[2].exception(), NotFound)
+    assert [result.item.args[1] for result in batch.results] == execution_ids
+    assert [result.item.args[1] for result in batch.failures] == missing
+    assert list(batch.failures_by_error()) == ['NotFound']
+
+    with pytest.raises(BatchError, match='2 of 10 calls failed: 2 NotFound') as e:
+        batch.raise_for_failures()
+    assert e.value.failures == batch.failures
+
+
+def test_batch_is_not_run_if_block_raises(make_client):
+    client = make_client()
+
+    with requests_mock.Mocker() as m:
+        with pytest.raises(RuntimeError):
+            with client.batch() as batch:
+                future = batch.delete_workflow_execution(service.create_workflow_id(), 'execution')
+                raise RuntimeError()
+
+    assert m.call_count == 0
+    assert future.cancelled()
+    with pytest.raises(CancelledError):
+        future.result()
+
+
+def test_cancelled_calls_are_not_made(make_client):
+    client = make_client()
+
+    with requests_mock.Mocker() as m:
+        m.delete(requests_mock.ANY, json={})
+        with client.batch() as batch:
+            batch.delete_workflow_execution(service.create_workflow_id(), 'a').cancel()
+            batch.delete_workflow_execution(service.create_workflow_id(), 'b')
+
+    assert m.call_count == 1
+    assert len(batch.results) == 1
+
+
+def test_batch_rejects_unknown_methods(make_client):
+    client = make_client()
+    batch = client.batch()
+    with pytest.raises(AttributeError):
+        batch.no_such_method()
+    with pytest.raises(AttributeError):
+        batch._make_request()
@@ -0,0 +1,274 @@
+import io
+import json
+import mmap
+import threading
+import time
+from base64 import b64encode
+
+import pytest
+import requests
+import requests_mock
+from las.client import Base64Content, NotFound, RawContent, _needs_preparation, parse_content
+
+from . import service
+
+
+FILE_SERVER = 'https://files.test'
+
+
+def mock_documents(m, client, fail_create=(), fail_upload=()):
+    uploads = []
+    lock = threading.Lock()
+
+    def post_document(request, context):
+        body = request.json()
+        if body.get('metadata', {}).get('i') in fail_create:
+            context.status_code = 404
+            return {'message': 'Not found'}
+        document_id = service.create_document_id()
+        return {**body, 'documentId': document_id, 'fileUrl': f'{FILE_SERVER}/{document_id}'}
+
+    def put_file(request, context):
+        if request.body in fail_upload:
+            context.status_code = 404
+            return json.dumps({'message': 'Not found'}).encode()
+        time.sleep(0.01)
+        with lock:
+            # Files given by path are memory-mapped only until the upload completes
+            uploads.append(bytes(request.body))
+        return b''
+
+    m.post(f'{client.credentials.api_endpoint}/documents', json=post_document)
+    m.put(requests_mock.ANY, content=put_file)
+    return uploads
+
+
+@pytest.mark.parametrize('ordered', [True, False])
+def test_create_documents(client_with_access_token, ordered):
+    client = client_with_access_token
+    contents = [f'document {i}'.encode() for i in range(20)]
+    items = [{'content': content, 'metadata': {'i': i}} for i, content in enumerate(contents)]
+
+    with requests_mock.Mocker() as m:
+        uploads = mock_documents(m, client)
+        results = list(client.create_documents(
+            items,
+            consent_id=service.create_consent_id(),
+            max_create_concurrency=2,
+            max_upload_concurrency=3,
+            ordered=ordered,
+        ))
+
+    assert sorted(uploads) == sorted(contents)
+    assert sorted(r.position for r in results) == list(range(len(items)))
+    if ordered:
+        assert [r.position for r in results] == list(range(len(items)))
+    for result in results:
+        assert result.ok
+        assert result.result['metadata'] == {'i': result.position}
+        assert 'consentId' in result.result
+
+
+def test_create_documents_captures_failures(client_with_access_token):
+    client = client_with_access_token
+    contents = [f'document {i}'.encode() for i in range(6)]
+    items = [{'content': content, 'metadata': {'i': i}} for i, content in enumerate(contents)]
+
+    with requests_mock.Mocker() as m:
+        mock_documents(m, client, fail_create={1}, fail_upload={contents[4]})
+        results = list(client.create_documents(items))
+
+    assert [r.ok for r in results] == [True, False, True, True, False, True]
+    assert isinstance(results[1].error, NotFound)
+    with pytest.raises(NotFound):
+        results[4].unwrap()
+    assert results[4].error.document['metadata'] == {'i': 4}
+
+
+def test_create_documents_is_lazy(client_with_access_token):
+    client = client_with_access_token
+    consumed = []
+
+    def contents():
+        for i in range(100):
+            consumed.append(i)
+            yield f'document {i}'.encode()
+
+    with requests_mock.Mocker() as m:
+        mock_documents(m, client)
+        results = client.create_documents(contents(), max_pending=4)
+        first = next(results)
+        results.close()
+
+    assert first.ok and first.position == 0
+    assert len(consumed) < 10
+
+
+def mock_predictions(m, client, fail_documents=()):
+    def post_prediction(request, context):
+        body = request.json()
+        if body['documentId'] in fail_documents:
+            context.status_code = 404
+            return {'message': 'Not found'}
+        return {**body, 'predictionId': service.create_prediction_id(), 'predictions': []}
+
+    m.post(f'{client.credentials.api_endpoint}/predictions', json=post_prediction)
+
+
+@pytest.mark.parametrize('ordered', [True, False])
+def test_create_predictions(client_with_access_token, ordered):
+    client = client_with_access_token
+    model_id = service.create_model_id()
+    document_ids = [service.create_document_id() for _ in range(10)]
+
+    with requests_mock.Mocker() as m:
+        mock_predictions(m, client, fail_documents={document_ids[3]})
+        results = list(client.create_predictions(
+            model_id,
+            document_ids,
+            preprocess_config=service.preprocess_config(),
+            max_concurrency=3,
+            ordered=ordered,
+        ))
+
+    assert sorted(r.item for r in results) == sorted(document_ids)
+    if ordered:
+        assert [r.item for r in results] == document_ids
+    for result in results:
+        if result.item == document_ids[3]:
+            assert isinstance(result.error, NotFound)
+        else:
+            assert result.result['modelId'] == model_id
+            assert result.result['preprocessConfig'] == service.preprocess_config()
+
+
+def test_create_predictions_from_list_documents(client_with_access_token):
+    client = client_with_access_token
+    dataset_id = service.create_dataset_id()
+    pages = [[service.create_document_id() for _ in range(3)] for _ in range(3)]
+
+    def list_documents(request, context):
+        assert request.qs['datasetid'] == [dataset_id]
+        page = int(request.qs.get('nexttoken', ['0'])[0])
+        next_token = str(page + 1) if page + 1 < len(pages) else None
+        return {'documents': [{'documentId': d} for d in pages[page]], 'nextToken': next_token}
+
+    with requests_mock.Mocker() as m:
+        m.get(f'{client.credentials.api_endpoint}/documents', json=list_documents)
+        mock_predictions(m, client)
+        results = list(client.create_predictions(service.create_model_id(), dataset_id=dataset_id, ordered=True))
+
+    assert [r.item for r in results] == [d for page in pages for d in page]
+    assert all(r.ok for r in results)
+
+
+def test_resume_create_document_upload(client_with_access_token, no_backoff_sleep):
+    client = client_with_access_token
+    content = b'resumable document'
+
+    with requests_mock.Mocker() as m:
+        m.post(f'{client.credentials.api_endpoint}/documents', json={
+            'documentId': service.create_document_id(),
+            'fileUrl': f'{FILE_SERVER}/file',
+        })
+        m.put(f'{FILE_SERVER}/file', [{'status_code': 503}] * 4 + [{'content': b''}])
+
+        with pytest.raises(requests.exceptions.RequestException) as e:
+            client.create_document(content)
+
+        document = client.upload_document_content(e.value.document, content)
+        posts = [request for request in m.request_history if request.method == 'POST']
+
+    assert document == e.value.document
+    assert len(posts) == 1
+    assert m.request_history[-1].body == content
+
+
+@pytest.mark.parametrize('content, error', [('/nonexistent/file.pdf', FileNotFoundError), (12345, TypeError)])
+def test_create_document_with_bad_content_creates_no_document(client_with_access_token, content, error):
+    client = client_with_access_token
+
+    with requests_mock.Mocker() as m:
+        mock_documents(m, client)
+        with pytest.raises(error):
+            client.create_document(content)
+        results = list(client.create_documents([content]))
+
+    assert isinstance(results[0].error, error)
+    assert m.call_count == 0
+
+
+def test_upload_from_path_is_memory_mapped_and_rewound_on_retry(client_with_access_token, no_backoff_sleep, tmp_path):
+    client = client_with_access_token
+    path = tmp_path / 'document.jpeg'
+    path.write_bytes(b'\xFF\xD8\xFF\xEE' + b'x' * 100000)
+    bodies = []
+
+    def put_file(request, context):
+        bodies.append(request.body.read())
+        context.status_code = 503 if len(bodies) == 1 else 200
+        return b''
+
+    with requests_mock.Mocker() as m:
+        m.post(f'{client.credentials.api_endpoint}/documents', json={'fileUrl': f'{FILE_SERVER}/file'})
+        m.put(f'{FILE_SERVER}/file', content=put_file)
+        client.create_document(path)
+
+    assert isinstance(m.request_history[-1].body, mmap.mmap)
+    assert m.request_history[-1].body.closed
+    assert bodies == [path.read_bytes()] * 2
+    assert parse_content(path, False, False) == (path.read_bytes(), None)
+
+
+def test_create_documents_with_prepare_processes(client_with_access_token, tmp_path):
+    client = client_with_access_token
+    path = tmp_path / 'document.jpeg'
+    path.write_bytes(b'document from path')
+    ground_truth = [{'label': 'total', 'value': str(i)} for i in range(1000)]
+    items = [
+        b'raw document',
+        b64encode(b'base64 document'),
+        path,
+        str(path),
+        io.BytesIO(b'document from stream'),
+        {'content': b'document with ground truth', 'ground_truth': ground_truth},
+    ]
+
+    with requests_mock.Mocker() as m:
+        uploads = mock_documents(m, client)
+        results = list(client.create_documents(items, dataset_id=service.create_dataset_id(), max_prepare_processes=2))
+
+    assert all(result.ok for result in results)
+    assert results[-1].result['groundTruth'] == ground_truth
+    assert all('datasetId' in result.result for result in results)
+    assert sorted(uploads) == sorted([
+        b'raw document',
+        b'base64 document',
+        b'document from path',
+        b'document from path',
+        b'document from stream',
+        b'document with ground truth',
+    ])
+
+
+@pytest.mark.parametrize('content, needs_preparation', [
+    (b'raw document', False),
+    (b'\xFF\xD8\xFF\xEE' * 100, False),
+    (RawContent(b'abcd' * 100), False),
+    ('document.pdf', False),
+    (b64encode(b'base64 document'), True),
+    (Base64Content(b64encode(b'base64 document')), True),
+])
+def test_only_base64_content_is_prepared_in_processes(content, needs_preparation):
+    assert _needs_preparation(content) == needs_preparation
+
+
+def test_create_documents_with_prepare_processes_captures_failures(client_with_access_token):
+    client = client_with_access_token
+
+    with requests_mock.Mocker() as m:
+        mock_documents(m, client)
+        results = list(client.create_documents([b'document', 1], max_prepare_processes=1))
+
+    assert results[0].ok
+    assert isinstance(results[1].error, TypeError)
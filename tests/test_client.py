@@ -5,7 +5,14 @@ from pathlib import Path
 
 import requests_mock
 import pytest
-from las.client import InvalidCredentialsException, LimitExceededException, TooManyRequestsException, parse_content
+from las.client import (
+    Base64Content,
+    InvalidCredentialsException,
+    LimitExceededException,
+    RawContent,
+    TooManyRequestsException,
+    parse_content,
+)
 
 from . import service
 
@@ -82,3 +89,28 @@ def test_parse_content(content):
 def test_parse_erroneous_content(content, error):
     with pytest.raises(error):
         parse_content(content)
+
+
+@pytest.mark.parametrize('content', [
+    RawContent(service.document_path().read_bytes()),
+    Base64Content(b64encode(service.document_path().read_bytes())),
+    Base64Content(b64encode(service.document_path().read_bytes()).decode()),
+])
+@pytest.mark.parametrize('base_64_encode', [True, False])
+def test_parse_declared_content(content, base_64_encode):
+    raw = service.document_path().read_bytes()
+    expected_content = b64encode(raw).decode() if base_64_encode else raw
+    assert parse_content(content, base_64_encode=base_64_encode) == (expected_content, None)
+
+
+def test_parse_content_declared_raw_is_not_decoded():
+    looks_like_base64 = b'abcd' * 100
+    assert parse_content(looks_like_base64, base_64_encode=False)[0] != looks_like_base64
+    assert parse_content(RawContent(looks_like_base64), base_64_encode=False)[0] == looks_like_base64
+
+
+@pytest.mark.parametrize('encode', [lambda raw: raw, b64encode, bytearray])
+@pytest.mark.parametrize('base_64_encode', [True, False])
+def test_parse_content_guesses_content_type(content, mime_type, encode, base_64_encode):
+    expected_content = b64encode(content).decode() if base_64_encode else content
+    assert parse_content(encode(content), True, base_64_encode) == (expected_content, mime_type)
@@ -0,0 +1,61 @@
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+from las import Credentials, Timeline
+from las.diagnostics import PHASES, request_with_phases
+
+from . import service
+
+
+class Handler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        body = json.dumps({'path': self.path, 'padding': 'x' * 100000}).encode()
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture(scope='module')
+def server():
+    server = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    yield f'http://localhost:{server.server_port}'
+    server.shutdown()
+
+
+def test_request_with_phases(server):
+    response, phases = request_with_phases('GET', f'{server}/documents', timeout=(5, 5))
+
+    assert response.json()['path'] == '/documents'
+    assert [phase.name for phase in phases] == ['dns', 'connect', 'send', 'ttfb', 'transfer']
+    assert all(phase.duration >= 0 for phase in phases)
+    assert all(before.end <= after.start for before, after in zip(phases, phases[1:]))
+
+
+def test_client_reports_phases(make_client, server):
+    credentials = Credentials('id', 'secret', 'auth.example.com', server)
+    client = make_client(credentials, connection_diagnostics=True, timeline=Timeline())
+    workflow_id = service.create_workflow_id()
+
+    for _ in range(3):
+        assert client.get_workflow(workflow_id)['path'] == f'/workflows/{workflow_id}'
+
+    endpoint_stats = client.stats()['GET /workflows/{id}']
+    assert set(endpoint_stats.phases) == {'dns', 'connect', 'send', 'ttfb', 'transfer'}
+    assert all(histogram.count == 3 for histogram in endpoint_stats.phases.values())
+    assert set(endpoint_stats.summary()['phases']) == set(endpoint_stats.phases)
+
+    report = client.stats().report().splitlines()
+    assert report[0].split() == ['endpoint', 'phase', 'count', 'p50', 'ms', 'p99', 'ms', 'max', 'ms']
+    assert [line.split()[2] for line in report[1:]] == ['total'] + [phase for phase in PHASES if phase != 'tls']
+
+    categories = [event.category for event in client.timeline.events]
+    assert categories.count('ttfb') == 3
+    assert 'response' not in categories
@@ -0,0 +1,125 @@
+import pickle
+import time
+
+import pytest
+import requests
+import requests_mock
+from las import HedgePolicy, RetryBudget
+
+from . import service
+
+
+def hedging_client(make_client, **hedge_args):
+    client = make_client(hedge_policy=HedgePolicy(min_samples=1, **hedge_args))
+    client.hedge_policy.observe('api', 0.05)
+    return client
+
+
+@pytest.fixture
+def first_call_is_slow(monkeypatch):
+    """Delay the first call to requests.get, outside of requests_mock which handles one request at a time"""
+    get = requests.get
+    calls = []
+
+    def slow_get(*args, **kwargs):
+        calls.append(args)
+        response = get(*args, **kwargs)
+        if len(calls) == 1:
+            time.sleep(seconds[0])
+        return response
+
+    seconds = [2.0]
+    monkeypatch.setattr(requests, 'get', slow_get)
+    return seconds
+
+
+def test_delay_is_percentile_of_observed_latencies():
+    hedge_policy = HedgePolicy(percentile=90, min_samples=10, max_delay=0.5)
+    for latency in range(1, 10):
+        hedge_policy.observe('api', latency / 100)
+    assert hedge_policy.delay('api') is None
+
+    hedge_policy.observe('api', 0.1)
+    assert hedge_policy.delay('api') == pytest.approx(0.09)
+    assert hedge_policy.delay('fileserver') is None
+
+    for _ in range(10):
+        hedge_policy.observe('api', 10)
+    assert hedge_policy.delay('api') == 0.5
+
+
+def test_hedge_policy_can_be_pickled():
+    hedge_policy = HedgePolicy(min_samples=1)
+    hedge_policy.observe('api', 0.05)
+
+    unpickled = pickle.loads(pickle.dumps(hedge_policy))
+    assert unpickled.delay('api') == 0.05
+    assert unpickled.send('api', lambda: 'response') == 'response'
+
+
+def test_slow_get_is_hedged(make_client, first_call_is_slow):
+    client = hedging_client(make_client)
+    workflow_id = service.create_workflow_id()
+
+    with requests_mock.Mocker() as m:
+        m.get(f'{client.credentials.api_endpoint}/workflows/{workflow_id}', json={'workflowId': workflow_id})
+        start = time.monotonic()
+        workflow = client.get_workflow(workflow_id)
+        elapsed = time.monotonic() - start
+
+    assert workflow == {'workflowId': workflow_id}
+    assert elapsed < 1
+    assert m.call_count == 2
+    assert client.hedge_policy.hedged == 1
+    assert client.hedge_policy.wins == 1
+
+
+def test_fast_get_is_not_hedged(make_client):
+    client = hedging_client(make_client, min_delay=0.5)
+    workflow_id = service.create_workflow_id()
+
+    with requests_mock.Mocker() as m:
+        m.get(f'{client.credentials.api_endpoint}/workflows/{workflow_id}', json={'workflowId': workflow_id})
+        assert client.get_workflow(workflow_id) == {'workflowId': workflow_id}
+
+    assert m.call_count == 1
+    assert client.hedge_policy.hedged == 0
+
+
+def test_hedging_is_capped_by_budget(make_client, first_call_is_slow):
+    first_call_is_slow[0] = 0.3
+    client = hedging_client(make_client, budget=RetryBudget(ratio=0, capacity=0))
+    workflow_id = service.create_workflow_id()
+
+    with requests_mock.Mocker() as m:
+        m.get(f'{client.credentials.api_endpoint}/workflows/{workflow_id}', json={'workflowId': workflow_id})
+        assert client.get_workflow(workflow_id) == {'workflowId': workflow_id}
+
+    assert m.call_count == 1
+    assert client.hedge_policy.hedged == 0
+
+
+def test_post_is_not_hedged(make_client):
+    client = hedging_client(make_client)
+    workflow_id = service.create_workflow_id()
+
+    with requests_mock.Mocker() as m:
+        m.post(f'{client.credentials.api_endpoint}/workflows/{workflow_id}/executions', json={})
+        assert client.execute_workflow(workflow_id, {}) == {}
+
+    assert m.call_count == 1
+
+
+def test_threads_are_reused(make_client):
+    client = hedging_client(make_client, min_delay=0.5)
+    workflow_id = service.create_workflow_id()
+
+    with requests_mock.Mocker() as m:
+        m.get(f'{client.credentials.api_endpoint}/workflows/{workflow_id}', json={'workflowId': workflow_id})
+        for _ in range(10):
+            assert client.get_workflow(workflow_id) == {'workflowId': workflow_id}
+            # The thread is idle once it has set the result of the request
+            time.sleep(0.01)
+
+    assert m.call_count == 10
+    assert client.hedge_policy._threads.started == 1
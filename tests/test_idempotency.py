@@ -0,0 +1,56 @@
+import requests_mock
+
+from . import service
+
+
+def test_idempotency_key_is_stable_across_retries(make_client, no_backoff_sleep):
+    client = make_client()
+    document_id = service.create_document_id()
+
+    with requests_mock.Mocker() as m:
+        m.post(f'{client.credentials.api_endpoint}/predictions', [
+            {'status_code': 503},
+            {'status_code': 502},
+            {'json': {'predictionId': service.create_prediction_id()}},
+        ])
+        client.create_prediction(document_id, service.create_model_id())
+        client.create_prediction(document_id, service.create_model_id())
+
+    keys = [request.headers['Idempotency-Key'] for request in m.request_history]
+    assert len(keys) == 4
+    assert keys[0] == keys[1] == keys[2]
+    assert keys[2] != keys[3]
+
+
+def test_idempotency_key_from_caller(make_client, no_backoff_sleep):
+    client = make_client()
+    workflow_id = service.create_workflow_id()
+
+    with requests_mock.Mocker() as m:
+        m.post(f'{client.credentials.api_endpoint}/workflows/{workflow_id}/executions', json={})
+        m.get(f'{client.credentials.api_endpoint}/workflows/{workflow_id}', json={})
+        client.execute_workflow(workflow_id, {}, idempotency_key='my-key')
+        client.get_workflow(workflow_id)
+
+    assert m.request_history[0].headers['Idempotency-Key'] == 'my-key'
+    assert 'Idempotency-Key' not in m.request_history[1].headers
+
+
+def test_bulk_idempotency_keys(make_client, no_backoff_sleep):
+    client = make_client()
+    document_ids = [service.create_document_id() for _ in range(5)]
+    contents = [f'document {i}'.encode() for i in range(5)]
+
+    with requests_mock.Mocker() as m:
+        m.post(f'{client.credentials.api_endpoint}/documents', json={'fileUrl': 'https://files.test/file'})
+        m.put('https://files.test/file', content=b'')
+        m.post(f'{client.credentials.api_endpoint}/predictions', json={})
+        list(client.create_documents([{'content': c, 'idempotency_key': f'doc-{i}'} for i, c in enumerate(contents)]))
+        list(client.create_predictions(
+            service.create_model_id(),
+            document_ids,
+            idempotency_key_fn=lambda document_id: f'prediction-{document_id}',
+        ))
+
+    keys = {request.headers.get('Idempotency-Key') for request in m.request_history if request.method == 'POST'}
+    assert keys == {f'doc-{i}' for i in range(5)} | {f'prediction-{d}' for d in document_ids}
@@ -0,0 +1,106 @@
+import threading
+import time
+from concurrent.futures import CancelledError
+from urllib.parse import unquote
+
+import pytest
+import requests_mock
+
+from . import service
+
+
+@pytest.mark.parametrize('ordered', [True, False])
+def test_map_method(make_client, ordered):
+    client = make_client()
+    prediction_ids = [service.create_prediction_id() for _ in range(10)]
+    missing = prediction_ids[3]
+
+    def get_prediction(request, context):
+        prediction_id = unquote(request.path.split('/')[-1])
+        if prediction_id == missing:
+            context.status_code = 404
+            return {'message': 'Not found'}
+        return {'predictionId': prediction_id}
+
+    with requests_mock.Mocker(case_sensitive=True) as m:
+        m.get(requests_mock.ANY, json=get_prediction)
+        results = list(client.map(
+            'get_prediction',
+            ({'prediction_id': prediction_id} for prediction_id in prediction_ids),
+            max_concurrency=4,
+            ordered=ordered,
+        ))
+
+    if ordered:
+        assert [result.position for result in results] == list(range(10))
+    results.sort(key=lambda result: result.position)
+    assert [result.item['prediction_id'] for result in results] == prediction_ids
+    assert [result.ok for result in results] == [prediction_id != missing for prediction_id in prediction_ids]
+    assert results[0].result == {'predictionId': prediction_ids[0]}
+    assert client.stats()['GET /predictions/{id}'].count == 10
+
+
+def test_map_callable_reports_progress(make_client):
+    client = make_client()
+    reported = []
+
+    def square(x):
+        if x == 2:
+            raise ValueError(x)
+        return x * x
+
+    results = list(client.map(square, [{'x': x} for x in range(5)], progress=lambda *p: reported.append(p)))
+
+    assert [result.result for result in results] == [0, 1, None, 9, 16]
+    assert isinstance(results[2].error, ValueError)
+    assert sorted(completed for completed, _ in reported) == [1, 2, 3, 4, 5]
+    assert max(reported) == (5, 1)
+
+
+def test_map_cancel(make_client):
+    client = make_client()
+    cancel = threading.Event()
+    started = []
+
+    def work(i):
+        started.append(i)
+        if i == 0:
+            cancel.set()
+        return i
+
+    def items():
+        for i in range(100):
+            yield {'i': i}
+
+    results = list(client.map(work, items(), max_concurrency=1, cancel=cancel))
+
+    assert results[0].result == 0
+    assert all(isinstance(result.error, CancelledError) for result in results[1:])
+    assert started == [0]
+    assert len(results) < 100
+
+
+def test_map_closing_cancels_pending_calls(make_client):
+    client = make_client()
+    started = []
+
+    def work(i):
+        started.append(i)
+        time.sleep(0.01)
+        return i
+
+    results = client.map(work, ({'i': i} for i in range(100)), max_concurrency=2)
+    assert next(results).result == 0
+    results.close()
+    time.sleep(0.05)
+
+    assert len(started) <= 4
+
+
+def test_map_rejects_private_methods(make_client):
+    client = make_client()
+
+    with pytest.raises(ValueError):
+        list(client.map('_make_request', [{}]))
+    with pytest.raises(ValueError):
+        list(client.map('no_such_method', [{}]))
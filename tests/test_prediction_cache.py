@@ -0,0 +1,107 @@
+import pickle
+
+import pytest
+import requests_mock
+from las import PredictionCache, SQLitePredictionCache
+
+from . import service
+
+FILE_SERVER = 'https://files.example.com'
+
+
+@pytest.fixture(params=['memory', 'sqlite'])
+def make_cache(request, tmp_path):
+    def make_cache(**cache_args):
+        if request.param == 'memory':
+            return PredictionCache(**cache_args)
+        return SQLitePredictionCache(tmp_path / 'predictions.db', **cache_args)
+    return make_cache
+
+
+def test_hits_and_misses(make_cache):
+    cache = make_cache()
+    key = cache.key('digest', 'model', preprocess_config={'imageQuality': 'HIGH'})
+
+    assert cache.get(key) is None
+    cache.put(key, {'predictionId': 'a'})
+    prediction = cache.get(key)
+    prediction['predictionId'] = 'modified'
+
+    assert cache.get(key) == {'predictionId': 'a'}
+    assert cache.key('digest', 'model', preprocess_config={'imageQuality': 'LOW'}) != key
+    assert (cache.hits, cache.misses, cache.hit_rate) == (2, 1, 2 / 3)
+
+
+def test_least_recently_used_are_evicted(make_cache, monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr('las.cache.time.time', lambda: now[0])
+    cache = make_cache(max_entries=2)
+
+    for key in 'abc':
+        now[0] += 1
+        cache.put(key, {'predictionId': key})
+        if key == 'b':
+            now[0] += 1
+            cache.get('a')
+
+    assert cache.get('b') is None
+    assert cache.get('a') == {'predictionId': 'a'}
+    assert cache.get('c') == {'predictionId': 'c'}
+    assert cache.evictions == 1
+
+
+def test_predictions_expire(make_cache, monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr('las.cache.time.time', lambda: now[0])
+    cache = make_cache(ttl=60)
+    cache.put('key', {'predictionId': 'a'})
+
+    now[0] += 59
+    assert cache.get('key') == {'predictionId': 'a'}
+    now[0] += 2
+    assert cache.get('key') is None
+
+
+def test_sqlite_cache_is_persistent(tmp_path):
+    SQLitePredictionCache(tmp_path / 'predictions.db').put('key', {'predictionId': 'a'})
+    assert SQLitePredictionCache(tmp_path / 'predictions.db').get('key') == {'predictionId': 'a'}
+
+
+def test_cache_can_be_pickled(make_cache):
+    cache = make_cache()
+    cache.remember_document('document', b'content')
+    cache.put('key', {'predictionId': 'a'})
+
+    unpickled = pickle.loads(pickle.dumps(cache))
+    assert unpickled.document_digest('document') == cache.document_digest('document')
+    assert unpickled.get('key') == {'predictionId': 'a'}
+    unpickled.put('other', {'predictionId': 'b'})
+    assert unpickled.get('other') == {'predictionId': 'b'}
+
+
+def test_client_reuses_predictions_of_identical_documents(make_client, make_cache):
+    client = make_client(prediction_cache=make_cache())
+    model_id = service.create_model_id()
+
+    def post_document(request, context):
+        document_id = service.create_document_id()
+        return {'documentId': document_id, 'fileUrl': f'{FILE_SERVER}/{document_id}'}
+
+    def post_prediction(request, context):
+        return {**request.json(), 'predictionId': service.create_prediction_id(), 'predictions': []}
+
+    with requests_mock.Mocker() as m:
+        m.post(f'{client.credentials.api_endpoint}/documents', json=post_document)
+        m.put(requests_mock.ANY, content=b'')
+        predictions = m.post(f'{client.credentials.api_endpoint}/predictions', json=post_prediction)
+
+        first, second, other = [client.create_document(content)['documentId'] for content in [b'a', b'a', b'b']]
+        prediction = client.create_prediction(first, model_id)
+        cached = client.create_prediction(second, model_id)
+        client.create_prediction(second, model_id, preprocess_config={'imageQuality': 'HIGH'})
+        client.create_prediction(other, model_id)
+        client.create_prediction(second, model_id, run_async=True)
+
+    assert cached == {**prediction, 'documentId': second}
+    assert predictions.call_count == 4
+    assert client.prediction_cache.hits == 1
@@ -0,0 +1,100 @@
+import pickle
+from urllib.parse import parse_qs, urlparse
+
+import pytest
+import requests_mock
+from las import Client, PredictionStore
+
+from . import service
+
+
+def listed_prediction(created_time):
+    return {
+        'predictionId': service.create_prediction_id(),
+        'createdTime': created_time,
+        'modelId': 'las:model:a',
+        'documentId': service.create_document_id(),
+    }
+
+
+def mock_list_predictions(m, client, predictions, page_size=2):
+    def list_predictions(request, context):
+        query = parse_qs(urlparse(request.url).query)
+        assert query['order'] == ['descending'] and query['sortBy'] == ['createdTime']
+        newest_first = sorted(predictions, key=lambda prediction: prediction['createdTime'], reverse=True)
+        start = int(query.get('nextToken', ['0'])[0])
+        end = start + page_size
+        return {
+            'predictions': newest_first[start:end],
+            'nextToken': str(end) if end < len(newest_first) else None,
+        }
+
+    return m.get(f'{client.credentials.api_endpoint}/predictions', json=list_predictions)
+
+
+def test_store_can_be_pickled(tmp_path):
+    store = PredictionStore(tmp_path / 'predictions.db')
+    store.put({'predictionId': 'a'})
+
+    unpickled = pickle.loads(pickle.dumps(store))
+    assert unpickled.get('a') == {'predictionId': 'a'}
+
+
+def test_get_prediction_is_served_from_store(make_client, tmp_path):
+    client = make_client(prediction_store=PredictionStore(tmp_path / 'predictions.db'))
+    prediction_id = service.create_prediction_id()
+    prediction = {'predictionId': prediction_id, 'predictions': [{'label': 'total', 'value': '1'}]}
+
+    with requests_mock.Mocker() as m:
+        get = m.get(
+            f'{client.credentials.api_endpoint}/predictions/{prediction_id}',
+            [{'json': {'predictionId': prediction_id}}, {'json': prediction}],
+        )
+        assert client.get_prediction(prediction_id) == {'predictionId': prediction_id}
+        assert client.get_prediction(prediction_id) == prediction
+        assert client.get_prediction(prediction_id) == prediction
+
+    assert get.call_count == 2
+    assert client.prediction_store.hits == 1
+
+    assert PredictionStore(tmp_path / 'predictions.db').get(prediction_id) == prediction
+
+
+def test_created_predictions_are_stored(make_client, tmp_path):
+    client = make_client(prediction_store=PredictionStore(tmp_path / 'predictions.db'))
+
+    def post_prediction(request, context):
+        return {**request.json(), 'predictionId': service.create_prediction_id(), 'predictions': []}
+
+    with requests_mock.Mocker() as m:
+        m.post(f'{client.credentials.api_endpoint}/predictions', json=post_prediction)
+        prediction = client.create_prediction(service.create_document_id(), service.create_model_id())
+        assert client.get_prediction(prediction['predictionId']) == prediction
+
+
+def test_sync_fetches_only_new_predictions(make_client, tmp_path):
+    client = make_client(prediction_store=PredictionStore(tmp_path / 'predictions.db'))
+    predictions = [listed_prediction(f'2026-10-0{day}T12:00:00+00:00') for day in range(1, 6)]
+
+    with requests_mock.Mocker() as m:
+        first_sync = mock_list_predictions(m, client, predictions)
+        assert client.sync_predictions() == predictions[::-1]
+        assert first_sync.call_count == 3
+
+        predictions.append(listed_prediction('2026-10-06T12:00:00+00:00'))
+        second_sync = mock_list_predictions(m, client, predictions)
+        assert client.sync_predictions() == predictions[::-1]
+        # The second page reaches predictions older than the last sync
+        assert second_sync.call_count == 2
+
+        predictions.append(listed_prediction('2026-10-06T12:00:00+00:00'))
+        third_sync = mock_list_predictions(m, client, predictions, page_size=1)
+        assert {p['predictionId'] for p in client.sync_predictions()} == {p['predictionId'] for p in predictions}
+        assert third_sync.call_count == 3
+
+    assert client.prediction_store.watermark() == '2026-10-06T12:00:00+00:00'
+
+
+def test_sync_requires_store():
+    with pytest.raises(ValueError):
+        Client().sync_predictions()
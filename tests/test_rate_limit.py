@@ -0,0 +1,45 @@
+import pickle
+import threading
+import time
+
+import pytest
+from las.rate_limit import RateLimiter
+
+
+def test_rate_limiter_allows_burst():
+    limiter = RateLimiter(rate=10, burst=5)
+    start = time.monotonic()
+    for _ in range(5):
+        limiter.acquire()
+    assert time.monotonic() - start < 0.05
+
+
+def test_rate_limiter_limits_rate_across_threads():
+    limiter = RateLimiter(rate=50, burst=1)
+    start = time.monotonic()
+    threads = [threading.Thread(target=lambda: [limiter.acquire() for _ in range(5)]) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert time.monotonic() - start >= 19 / 50
+
+
+def test_rate_limiter_rejects_invalid_rate():
+    with pytest.raises(ValueError):
+        RateLimiter(rate=0)
+
+
+def test_rate_limiter_pause():
+    limiter = RateLimiter(rate=1000)
+    limiter.pause(0.1)
+    assert limiter.acquire() >= 0.09
+
+
+def test_rate_limiter_can_be_pickled():
+    limiter = pickle.loads(pickle.dumps(RateLimiter(rate=10, burst=2)))
+    start = time.monotonic()
+    limiter.acquire()
+    limiter.acquire()
+    assert time.monotonic() - start < 0.05
+    assert limiter.rate == 10
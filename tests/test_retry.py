@@ -0,0 +1,196 @@
+import json
+import pickle
+import time
+from email.utils import formatdate
+
+import pytest
+import requests
+import requests_mock
+from las import Client, HedgePolicy, PredictionCache, PredictionStore, RetryBudget, RetryPolicy, Timeline
+from las.client import BadRequest, TooManyRequestsException
+from las.retry import RateLimitStatus, parse_rate_limit, parse_retry_after, retry_delay, server_hinted_expo
+from requests.exceptions import ConnectionError, HTTPError
+
+from . import service
+
+
+TOO_MANY_REQUESTS = json.dumps({'message': 'Too Many Requests'}).encode()
+
+
+@pytest.fixture
+def sleeps(monkeypatch):
+    sleeps = []
+    monkeypatch.setattr('backoff._sync.time.sleep', sleeps.append)
+    return sleeps
+
+
+@pytest.mark.parametrize('headers,expected', [
+    ({}, None),
+    ({'Retry-After': '3'}, 3),
+    ({'Retry-After': '-1'}, 0),
+    ({'Retry-After': 'soon'}, None),
+    ({'Retry-After': lambda: formatdate(time.time() + 30, usegmt=True)}, 30),
+])
+def test_parse_retry_after(headers, expected):
+    retry_after = parse_retry_after({k: v() if callable(v) else v for k, v in headers.items()})
+    assert retry_after == pytest.approx(expected, abs=1.5) if expected else retry_after == expected
+
+
+def test_parse_rate_limit():
+    assert parse_rate_limit({}) is None
+    status = parse_rate_limit({'X-RateLimit-Limit': '100', 'X-RateLimit-Remaining': '7', 'X-RateLimit-Reset': '10'})
+    assert status.limit == 100 and status.remaining == 7
+    assert status.reset_at == pytest.approx(time.time() + 10, abs=1)
+    status = parse_rate_limit({'RateLimit-Remaining': '0', 'RateLimit-Reset': str(int(time.time()) + 20)})
+    assert status == RateLimitStatus(None, 0, pytest.approx(time.time() + 20, abs=1))
+
+
+def test_retry_delay_from_exhausted_budget():
+    assert retry_delay({'X-RateLimit-Remaining': '1', 'X-RateLimit-Reset': '5'}) is None
+    assert retry_delay({'X-RateLimit-Remaining': '0', 'X-RateLimit-Reset': '5'}) == pytest.approx(5, abs=1)
+    assert retry_delay({'Retry-After': '2', 'X-RateLimit-Remaining': '0', 'X-RateLimit-Reset': '5'}) == 2
+
+
+def test_server_hinted_expo():
+    class HintedError(Exception):
+        retry_after = 4
+
+    wait = server_hinted_expo(jitter=0.5)
+    wait.send(None)
+    for _ in range(3):
+        assert 4 <= wait.send(HintedError()) <= 6
+    assert 0 <= wait.send(Exception()) <= 8
+
+
+def test_too_many_requests_honors_retry_after(client_with_access_token, sleeps):
+    client = client_with_access_token
+    workflow_id = service.create_workflow_id()
+
+    with requests_mock.Mocker() as m:
+        m.get(f'{client.credentials.api_endpoint}/workflows/{workflow_id}', [
+            {'status_code': 429, 'content': TOO_MANY_REQUESTS, 'headers': {'Retry-After': '3'}},
+            {'status_code': 503, 'headers': {'Retry-After': '5'}},
+            {'json': {'workflowId': workflow_id}, 'headers': {'X-RateLimit-Limit': '10', 'X-RateLimit-Remaining': '9'}},
+        ])
+        assert client.get_workflow(workflow_id) == {'workflowId': workflow_id}
+
+    assert len(sleeps) == 2
+    assert 3 <= sleeps[0] <= 4
+    assert 5 <= sleeps[1] <= 6
+    assert client.rate_limit_status.limit == 10
+    assert client.rate_limit_status.remaining == 9
+
+
+def http_error(status_code, headers=None):
+    response = requests.Response()
+    response.status_code = status_code
+    response.headers.update(headers or {})
+    return HTTPError(response=response)
+
+
+@pytest.mark.parametrize('exception,retryable', [
+    (TooManyRequestsException(), True),
+    (TooManyRequestsException(retry_after=100), False),
+    (http_error(503), True),
+    (http_error(503, {'Retry-After': '100'}), False),
+    (http_error(501), False),
+    (http_error(404), False),
+    (ConnectionError(), True),
+    (BadRequest(), False),
+    (ValueError(), False),
+])
+def test_retry_policy_is_retryable(exception, retryable):
+    assert RetryPolicy(max_delay=30).is_retryable(exception) == retryable
+
+
+def test_retry_policy_delays():
+    wait = RetryPolicy(base_delay=0.5, max_delay=2, jitter=0).wait_gen()
+    wait.send(None)
+    assert [wait.send(Exception()) for _ in range(4)] == [0.5, 1, 2, 2]
+
+
+def test_retry_budget():
+    budget = RetryBudget(ratio=0.5, capacity=2)
+    assert budget.withdraw() and budget.withdraw()
+    assert not budget.withdraw()
+    budget.deposit()
+    assert not budget.withdraw()
+    budget.deposit()
+    assert budget.withdraw()
+
+
+def test_retry_budget_can_be_pickled():
+    budget = RetryBudget(ratio=0.5, capacity=2)
+    assert budget.withdraw()
+
+    unpickled = pickle.loads(pickle.dumps(budget))
+    assert unpickled.tokens == 1
+    assert unpickled.withdraw()
+    assert not unpickled.withdraw()
+
+
+def test_client_can_be_pickled(make_client, tmp_path):
+    client = make_client(
+        max_requests_per_second=100,
+        retry_budget=RetryBudget(ratio=0, capacity=5),
+        coalesce_requests=True,
+        hedge_policy=HedgePolicy(),
+        timeline=Timeline(),
+        prediction_cache=PredictionCache(),
+        prediction_store=PredictionStore(tmp_path / 'predictions.db'),
+    )
+    workflow_id = service.create_workflow_id()
+
+    unpickled = pickle.loads(pickle.dumps(client))
+    with requests_mock.Mocker() as m:
+        m.get(f'{client.credentials.api_endpoint}/workflows/{workflow_id}', json={'workflowId': workflow_id})
+        assert unpickled.get_workflow(workflow_id) == {'workflowId': workflow_id}
+
+    assert unpickled.credentials.access_token == client.credentials.access_token
+    assert unpickled.retry_budget.tokens == 5
+    assert unpickled.stats()['GET /workflows/{id}'].count == 1
+    assert unpickled.timeline.recorded > 0
+
+
+def test_retry_policy_max_attempts(sleeps):
+    client = Client(retry_policy=RetryPolicy(max_attempts=2))
+    workflow_id = service.create_workflow_id()
+
+    with requests_mock.Mocker() as m:
+        m.post('/token', json={'access_token': 'token', 'expires_in': 1000})
+        m.get(f'{client.credentials.api_endpoint}/workflows/{workflow_id}', status_code=503)
+        with pytest.raises(HTTPError):
+            client.get_workflow(workflow_id)
+        assert m.call_count == 3
+
+    assert len(sleeps) == 1
+
+
+def test_retry_budget_is_only_spent_on_retries(make_client, sleeps):
+    budget = RetryBudget(ratio=0, capacity=10)
+    client = make_client(retry_policy=RetryPolicy(max_attempts=3), retry_budget=budget)
+    workflow_id = service.create_workflow_id()
+
+    with requests_mock.Mocker() as m:
+        m.get(f'{client.credentials.api_endpoint}/workflows/{workflow_id}', status_code=503)
+        with pytest.raises(HTTPError):
+            client.get_workflow(workflow_id)
+        assert m.call_count == 3
+
+    assert len(sleeps) == 2
+    assert budget.tokens == 10 - len(sleeps)
+
+
+def test_exhausted_retry_budget_fails_fast(sleeps):
+    client = Client(retry_budget=RetryBudget(ratio=0, capacity=2))
+    workflow_id = service.create_workflow_id()
+
+    with requests_mock.Mocker() as m:
+        m.post('/token', json={'access_token': 'token', 'expires_in': 1000})
+        m.get(f'{client.credentials.api_endpoint}/workflows/{workflow_id}', status_code=503)
+        for _ in range(3):
+            with pytest.raises(HTTPError):
+                client.get_workflow(workflow_id)
+        assert m.call_count == 1 + 5
+
+    assert len(sleeps) == 2
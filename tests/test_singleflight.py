@@ -0,0 +1,81 @@
+import pickle
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+import requests_mock
+from las.client import NotFound
+from las.singleflight import SingleFlight
+
+from . import service
+
+
+def slow(response, status_code=200):
+    def callback(request, context):
+        time.sleep(0.2)
+        context.status_code = status_code
+        return response
+    return callback
+
+
+@pytest.mark.parametrize('coalesce_requests,expected_calls', [(True, 1), (False, 8)])
+def test_concurrent_identical_gets_are_coalesced(make_client, coalesce_requests, expected_calls):
+    client = make_client(coalesce_requests=coalesce_requests)
+    workflow_id = service.create_workflow_id()
+
+    with requests_mock.Mocker() as m:
+        m.get(f'{client.credentials.api_endpoint}/workflows/{workflow_id}', json=slow({'workflowId': workflow_id}))
+        with ThreadPoolExecutor(8) as executor:
+            results = list(executor.map(lambda _: client.get_workflow(workflow_id), range(8)))
+
+    assert m.call_count == expected_calls
+    assert all(result == {'workflowId': workflow_id} for result in results)
+    assert len({id(result) for result in results}) == expected_calls
+    if coalesce_requests:
+        assert client.singleflight.calls == 8
+        assert client.singleflight.coalesced == 7
+
+
+def test_different_requests_are_not_coalesced(make_client):
+    client = make_client(coalesce_requests=True)
+    workflow_ids = [service.create_workflow_id() for _ in range(4)]
+
+    with requests_mock.Mocker() as m:
+        for workflow_id in workflow_ids:
+            m.get(f'{client.credentials.api_endpoint}/workflows/{workflow_id}', json=slow({'workflowId': workflow_id}))
+        m.post(f'{client.credentials.api_endpoint}/workflows/{workflow_ids[0]}/executions', json=slow({}))
+        with ThreadPoolExecutor(8) as executor:
+            results = list(executor.map(client.get_workflow, workflow_ids * 2))
+            list(executor.map(lambda _: client.execute_workflow(workflow_ids[0], {}), range(4)))
+
+    assert [result['workflowId'] for result in results] == workflow_ids * 2
+    assert m.call_count == 4 + 4
+
+
+def test_coalesced_errors_are_shared(make_client):
+    client = make_client(coalesce_requests=True)
+    workflow_id = service.create_workflow_id()
+
+    with requests_mock.Mocker() as m:
+        m.get(f'{client.credentials.api_endpoint}/workflows/{workflow_id}', json=slow({'message': 'Not found'}, 404))
+        with ThreadPoolExecutor(4) as executor:
+            futures = [executor.submit(client.get_workflow, workflow_id) for _ in range(4)]
+
+    assert m.call_count == 1
+    assert all(isinstance(future.exception(), NotFound) for future in futures)
+
+
+def test_singleflight_runs_again_after_completion():
+    singleflight = SingleFlight()
+    assert singleflight.do('key', lambda: 1) == 1
+    assert singleflight.do('key', lambda: 2) == 2
+    assert singleflight.coalesced == 0
+
+
+def test_singleflight_can_be_pickled():
+    singleflight = SingleFlight()
+    assert singleflight.do('key', lambda: 1) == 1
+
+    unpickled = pickle.loads(pickle.dumps(singleflight))
+    assert unpickled.do('key', lambda: 2) == 2
+    assert unpickled.calls == 2
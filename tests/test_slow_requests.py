@@ -0,0 +1,57 @@
+import logging
+
+import pytest
+import requests_mock
+from las.client import NotFound
+
+from . import service
+
+
+def test_slow_requests_are_logged(make_client, no_backoff_sleep, caplog):
+    slow_client = make_client(slow_request_threshold=0)
+    workflow_id = service.create_workflow_id()
+
+    with requests_mock.Mocker() as m:
+        m.post(f'{slow_client.credentials.api_endpoint}/workflows/{workflow_id}/executions', [
+            {'status_code': 503, 'json': {'message': 'Service Unavailable'}},
+            {'json': {'executionId': 'abc'}},
+        ])
+        with caplog.at_level(logging.WARNING, logger='las.client'):
+            slow_client.execute_workflow(workflow_id, {'key': 'value'})
+
+    record, = [record for record in caplog.records if record.getMessage().startswith('Slow request')]
+    assert 'POST /workflows/{id}/executions' in record.getMessage()
+    assert '2 attempt(s), succeeded, status 200' in record.getMessage()
+    assert record.slow_request['sent'] == len('{"input": {"key": "value"}}')
+    assert record.slow_request['received'] == len('{"executionId": "abc"}')
+    assert record.slow_request['attempts'] == 2
+
+
+def test_fast_requests_are_not_logged(make_client, no_backoff_sleep, caplog):
+    slow_client = make_client(slow_request_threshold=0)
+    slow_client.slow_request_threshold = 60
+    workflow_id = service.create_workflow_id()
+
+    with requests_mock.Mocker() as m:
+        m.get(f'{slow_client.credentials.api_endpoint}/workflows/{workflow_id}', json={})
+        with caplog.at_level(logging.WARNING, logger='las.client'):
+            slow_client.get_workflow(workflow_id)
+
+    assert not [record for record in caplog.records if record.getMessage().startswith('Slow request')]
+
+
+def test_large_error_bodies_are_summarized(make_client, no_backoff_sleep, caplog):
+    slow_client = make_client(slow_request_threshold=0)
+    workflow_id = service.create_workflow_id()
+    body = b'{"message": "Not found", "details": "' + b'x' * 10 ** 6 + b'"}'
+
+    with requests_mock.Mocker() as m:
+        m.get(f'{slow_client.credentials.api_endpoint}/workflows/{workflow_id}', status_code=404, content=body)
+        with caplog.at_level(logging.WARNING, logger='las.client'), pytest.raises(NotFound):
+            slow_client.get_workflow(workflow_id)
+
+    error, = [record for record in caplog.records if record.getMessage().startswith('Status code 404')]
+    slow, = [record for record in caplog.records if record.getMessage().startswith('Slow request')]
+    assert len(error.getMessage()) < 1000
+    assert f'({len(body)} bytes, sha256 ' in error.getMessage()
+    assert '1 attempt(s), failed, status 404' in slow.getMessage()
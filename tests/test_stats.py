@@ -0,0 +1,99 @@
+import pickle
+
+import pytest
+import requests_mock
+from las.client import NotFound
+from las.stats import LatencyHistogram, Stats, StatsRecorder, endpoint_template
+
+from . import service
+
+
+@pytest.mark.parametrize('path,template', [
+    ('/documents', '/documents'),
+    ('/documents/las:document:abc', '/documents/{id}'),
+    ('/models/las%3Amodel%3Aabc/trainings/las:training:abc', '/models/{id}/trainings/{id}'),
+    ('/transitions/las:transition:abc/executions/las:transition-execution:abc/heartbeats',
+     '/transitions/{id}/executions/{id}/heartbeats'),
+])
+def test_endpoint_template(path, template):
+    assert endpoint_template(path) == template
+
+
+def test_histogram_quantiles():
+    histogram = LatencyHistogram()
+    for millisecond in range(1, 1001):
+        histogram.record(millisecond / 1000)
+
+    assert histogram.count == 1000
+    assert histogram.max == 1
+    for q in [0.5, 0.9, 0.99]:
+        assert histogram.quantile(q) == pytest.approx(q, rel=0.1)
+    assert len(histogram.buckets) < 100
+    assert LatencyHistogram().quantile(0.5) is None
+
+
+def test_histogram_merge():
+    fast, slow = LatencyHistogram(), LatencyHistogram()
+    for _ in range(50):
+        fast.record(0.01)
+        slow.record(1)
+
+    fast.merge(slow)
+    assert fast.count == 100
+    assert fast.quantile(0.25) == pytest.approx(0.01, rel=0.1)
+    assert fast.quantile(0.75) == 1
+
+
+def test_client_stats(make_client, no_backoff_sleep):
+    client = make_client()
+    workflow_ids = [service.create_workflow_id() for _ in range(3)]
+    missing_workflow_id = service.create_workflow_id()
+
+    with requests_mock.Mocker() as m:
+        for workflow_id in workflow_ids:
+            m.get(f'{client.credentials.api_endpoint}/workflows/{workflow_id}', [
+                {'status_code': 503, 'json': {'message': 'Service Unavailable'}},
+                {'json': {'workflowId': workflow_id}},
+            ])
+            client.get_workflow(workflow_id)
+        m.get(f'{client.credentials.api_endpoint}/workflows/{missing_workflow_id}', status_code=404, json={})
+        with pytest.raises(NotFound):
+            client.get_workflow(missing_workflow_id)
+        m.get(f'{client.credentials.api_endpoint}/workflows', json={'workflows': []})
+        client.list_workflows()
+
+    stats = client.stats()
+    assert set(stats) == {'GET /workflows/{id}', 'GET /workflows'}
+    assert stats['GET /workflows/{id}'].count == 4
+    assert stats['GET /workflows/{id}'].retries == 3
+    assert stats['GET /workflows/{id}'].errors == 1
+    assert stats['GET /workflows/{id}'].error_rate == 0.25
+    assert stats['GET /workflows/{id}'].p50 <= stats['GET /workflows/{id}'].max
+    assert stats['GET /workflows'].summary()['count'] == 1
+
+    assert client.stats(reset=True).summary() == stats.summary()
+    assert client.stats() == {}
+
+
+def test_stats_merge_across_processes(make_client, no_backoff_sleep):
+    client = make_client()
+    workflow_id = service.create_workflow_id()
+
+    with requests_mock.Mocker() as m:
+        m.get(f'{client.credentials.api_endpoint}/workflows/{workflow_id}', json={})
+        client.get_workflow(workflow_id)
+
+    stats = client.stats()
+    merged = Stats().merge(stats).merge(pickle.loads(pickle.dumps(stats)))
+    assert merged['GET /workflows/{id}'].count == 2
+    assert stats['GET /workflows/{id}'].count == 1
+
+
+def test_stats_recorder_can_be_pickled():
+    recorder = StatsRecorder()
+    recorder.record('GET /workflows/{id}', 0.1)
+
+    unpickled = pickle.loads(pickle.dumps(recorder))
+    unpickled.record('GET /workflows/{id}', 0.2, error=True)
+    assert unpickled.snapshot()['GET /workflows/{id}'].count == 2
+    assert recorder.snapshot()['GET /workflows/{id}'].count == 1
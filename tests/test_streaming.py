@@ -0,0 +1,50 @@
+import json
+from base64 import b64encode
+from os import urandom
+
+import pytest
+import requests_mock
+from las.streaming import Base64JSONBody
+
+from . import service
+
+
+@pytest.mark.parametrize('size', [0, 1, 2, 3, 4, 1000, 2 ** 16 + 1, 2 ** 18])
+@pytest.mark.parametrize('fields', [{}, {'name': 'foo "bar"', 'description': None}])
+def test_base64_json_body(size, fields):
+    raw = urandom(size)
+    expected = json.dumps({**fields, 'content': b64encode(raw).decode()}).encode()
+    body = Base64JSONBody(fields, 'content', raw)
+    assert len(body) == len(expected)
+    assert body.read() == expected
+
+    body.seek(0)
+    chunks = iter(lambda: body.read(1001), b'')
+    assert b''.join(chunks) == expected
+
+
+def test_create_and_update_asset_stream_content(make_client, no_backoff_sleep, tmp_path):
+    client = make_client()
+    asset_id = service.create_asset_id()
+    path = tmp_path / 'bundle.js'
+    path.write_bytes(urandom(300000))
+    bodies = []
+
+    def store_body(request, context):
+        bodies.append(json.loads(request.body.read()))
+        context.status_code = 503 if len(bodies) == 1 else 200
+        return {'assetId': asset_id}
+
+    with requests_mock.Mocker() as m:
+        m.post(f'{client.credentials.api_endpoint}/assets', json=store_body)
+        m.patch(f'{client.credentials.api_endpoint}/assets/{asset_id}', json=store_body)
+        client.create_asset(path, name='foo')
+        client.update_asset(asset_id, content=path, description='bar')
+        assert int(m.request_history[0].headers['Content-Length']) == len(m.request_history[0].body)
+
+    content = b64encode(path.read_bytes()).decode()
+    assert bodies == [
+        {'name': 'foo', 'content': content},
+        {'name': 'foo', 'content': content},
+        {'description': 'bar', 'content': content},
+    ]
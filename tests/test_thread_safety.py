@@ -0,0 +1,146 @@
+import json
+import pickle
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+import requests
+from las import Client, Credentials, RetryBudget, RetryPolicy
+from las.credentials import read_token_from_cache
+
+from . import service
+
+TOKEN_LIFETIME = 0.2
+
+
+class Server(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self):
+        super().__init__(('127.0.0.1', 0), Handler)
+        self.lock = threading.Lock()
+        self.tokens = {}
+        self.token_times = []
+        self.requests = 0
+        self.responses = 0
+        self.rejected = 0
+
+
+class Handler(BaseHTTPRequestHandler):
+    server: Server
+
+    def do_POST(self):
+        with self.server.lock:
+            access_token = f'token-{len(self.server.tokens)}'
+            self.server.tokens[access_token] = time.time() + TOKEN_LIFETIME
+            self.server.token_times.append(time.time())
+        # Widen the window in which other threads see the expired token
+        time.sleep(0.02)
+        self._respond(200, {'access_token': access_token, 'expires_in': TOKEN_LIFETIME})
+
+    def do_GET(self):
+        access_token = self.headers['Authorization'][len('Bearer '):]
+        with self.server.lock:
+            self.server.requests += 1
+            known = access_token in self.server.tokens
+            # Inject a 429 in every fifth request
+            throttled = self.server.requests % 5 == 0
+            self.server.rejected += throttled
+            self.server.responses += known and not throttled
+        if not known:
+            self._respond(401, {'message': 'Unknown token'})
+        elif throttled:
+            self._respond(429, {'message': 'Too many requests'}, {'Retry-After': '0'})
+        else:
+            self._respond(200, {'path': self.path})
+
+    def _respond(self, status, body, headers=None):
+        data = json.dumps(body).encode()
+        self.send_response(status)
+        for name, value in {'Content-Type': 'application/json', **(headers or {})}.items():
+            self.send_header(name, value)
+        self.send_header('Content-Length', str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def server(monkeypatch):
+    server = Server()
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    post = requests.post
+
+    def post_to_server(url, **kwargs):
+        # Tokens are fetched over https, which the stand-in server does not speak, from /token, which is mocked
+        return post(url.replace('https://', 'http://').replace('/token', '/oauth2/token'), **kwargs)
+
+    monkeypatch.setattr('las.credentials.requests.post', post_to_server)
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+def test_client_shared_by_many_threads(server, tmp_path):
+    endpoint = f'127.0.0.1:{server.server_port}'
+    cache_path = tmp_path / 'token-cache.json'
+    credentials = Credentials('id', 'secret', endpoint, f'http://{endpoint}', 'default', cache_path)
+    client = Client(
+        credentials,
+        retry_policy=RetryPolicy(max_attempts=10, base_delay=0.001, jitter=0),
+        retry_budget=RetryBudget(ratio=1, capacity=1000),
+    )
+    workflow_id = service.create_workflow_id()
+    calls = 1000
+
+    with ThreadPoolExecutor(32) as executor:
+        results = list(executor.map(lambda _: client.get_workflow(workflow_id), range(calls)))
+
+    assert all(result == {'path': f'/workflows/{workflow_id}'} for result in results)
+    assert server.responses == calls
+    assert server.rejected > 0
+    assert len(server.tokens) > 1, 'The test should run through token expiry'
+    # A token is only fetched once the previous token has expired
+    intervals = [after - before for before, after in zip(server.token_times, server.token_times[1:])]
+    assert min(intervals) >= TOKEN_LIFETIME
+    assert read_token_from_cache('default', cache_path) == credentials._token
+
+    endpoint_stats = client.stats()['GET /workflows/{id}']
+    assert endpoint_stats.count == calls
+    assert endpoint_stats.errors == 0
+    assert endpoint_stats.retries == server.rejected
+
+
+def test_token_cache_is_shared_by_many_credentials(server, tmp_path):
+    endpoint = f'127.0.0.1:{server.server_port}'
+    cache_path = tmp_path / 'token-cache.json'
+    profiles = [f'profile-{i}' for i in range(8)]
+    credentials = [Credentials('id', 'secret', endpoint, f'http://{endpoint}', p, cache_path) for p in profiles]
+
+    def fetch_tokens(c):
+        for _ in range(5):
+            c._token = ('', 0)
+            c.access_token
+
+    with ThreadPoolExecutor(len(credentials)) as executor:
+        list(executor.map(fetch_tokens, credentials))
+
+    cache = json.loads(cache_path.read_text())
+    assert sorted(cache) == profiles
+    assert all(read_token_from_cache(p, cache_path) == c._token for p, c in zip(profiles, credentials))
+
+
+def test_credentials_can_be_pickled(server, tmp_path):
+    endpoint = f'127.0.0.1:{server.server_port}'
+    credentials = Credentials('id', 'secret', endpoint, f'http://{endpoint}', 'default', tmp_path / 'token-cache.json')
+    access_token = credentials.access_token
+
+    unpickled = pickle.loads(pickle.dumps(credentials))
+    assert unpickled.access_token == access_token
+    unpickled._token = ('', 0)
+    assert unpickled.access_token != access_token
+    assert credentials.access_token == access_token
@@ -0,0 +1,84 @@
+import json
+import pickle
+
+import requests_mock
+from las import Timeline
+
+from . import service
+
+
+def test_ring_buffer_keeps_most_recent_events():
+    timeline = Timeline(capacity=3)
+    for i in range(5):
+        timeline.record(f'event {i}', 'call', i, i + 1)
+
+    assert [event.name for event in timeline.events] == ['event 2', 'event 3', 'event 4']
+    assert timeline.recorded == 5
+    assert timeline.dropped == 2
+
+
+def test_export_chrome_trace(tmp_path):
+    timeline = Timeline()
+    with timeline.span('GET /documents/{id}', 'http') as args:
+        args['status'] = 200
+    timeline.record_async('create', 'queue', 0, 0.5)
+
+    path = tmp_path / 'trace.json'
+    timeline.export(path)
+    trace_events = json.loads(path.read_text())['traceEvents']
+
+    metadata, complete, begin, end = trace_events
+    assert metadata['ph'] == 'M' and metadata['args']['name'] == 'MainThread'
+    assert complete['ph'] == 'X' and complete['args'] == {'status': 200} and complete['dur'] >= 0
+    assert (begin['ph'], end['ph']) == ('b', 'e')
+    assert begin['id'] == end['id'] and end['ts'] - begin['ts'] == 0.5e6
+
+
+def test_timeline_can_be_pickled():
+    timeline = Timeline(capacity=3)
+    timeline.record_async('create', 'queue', 0, 0.5)
+
+    unpickled = pickle.loads(pickle.dumps(timeline))
+    unpickled.record_async('create', 'queue', 0.5, 1)
+    assert [event.start for event in unpickled.events] == [0, 0.5]
+    assert len({event.async_id for event in unpickled.events}) == 2
+    assert unpickled.events.maxlen == 3
+
+
+def test_client_records_phases(make_client, no_backoff_sleep):
+    client = make_client(timeline=Timeline(), max_requests_per_second=1000)
+    workflow_id = service.create_workflow_id()
+
+    with requests_mock.Mocker() as m:
+        m.get(f'{client.credentials.api_endpoint}/workflows/{workflow_id}', [
+            {'status_code': 503, 'json': {'message': 'Service Unavailable'}},
+            {'json': {'workflowId': workflow_id}},
+        ])
+        client.get_workflow(workflow_id)
+
+    events = list(client.timeline.events)
+    categories = [event.category for event in events]
+    assert categories.count('http') == 2
+    assert categories.count('response') == categories.count('transfer') == 2
+    assert categories.count('backoff') == 1
+    assert [event.args['status'] for event in events if event.category == 'http'] == [503, 200]
+
+    call, = [event for event in events if event.category == 'call']
+    assert call.name == 'GET /workflows/{id}'
+    assert call.args == {'attempts': 2, 'error': False}
+    assert all(call.start <= event.start and event.end <= call.end for event in events if event.category == 'http')
+
+
+def test_bulk_queue_waits(make_client, no_backoff_sleep):
+    client = make_client(timeline=Timeline())
+    document_ids = [service.create_document_id() for _ in range(6)]
+
+    with requests_mock.Mocker() as m:
+        m.post(f'{client.credentials.api_endpoint}/predictions', json={'predictionId': service.create_prediction_id()})
+        results = list(client.create_predictions(service.create_model_id(), document_ids, max_concurrency=2))
+
+    assert all(result.ok for result in results)
+    queue_waits = [event for event in client.timeline.events if event.category == 'queue']
+    assert len(queue_waits) == len(document_ids)
+    assert len({event.async_id for event in queue_waits}) == len(document_ids)
+    assert len({event.thread_id for event in client.timeline.events if event.category == 'call'}) == 2
@@ -0,0 +1,121 @@
+import time
+
+import pytest
+import requests_mock
+from las import RetryPolicy, Timeout
+from las.client import DeadlineExceeded
+from las.credentials import NULL_TOKEN
+from las.rate_limit import RateLimiter
+from las.timeouts import bounded, deadline, remaining_time
+from requests.exceptions import RequestException
+
+from . import service
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    """A fake monotonic clock that only sleeping advances, so that the tests do not depend on the speed of the runner"""
+    now = [1000.0]
+
+    def sleep(seconds):
+        now[0] += seconds
+
+    monkeypatch.setattr(time, 'monotonic', lambda: now[0])
+    monkeypatch.setattr(time, 'sleep', sleep)
+    return now
+
+
+class FakeLock:
+    def __init__(self):
+        self.timeouts = []
+
+    def acquire(self, blocking=True, timeout=-1):
+        self.timeouts.append(timeout)
+        return False
+
+
+@pytest.fixture
+def timeout_client(make_client):
+    return make_client(
+        retry_policy=RetryPolicy(max_attempts=10, base_delay=0.1, jitter=0),
+        api_timeout=Timeout(1, 2),
+        fileserver_timeout=Timeout(3, 4),
+    )
+
+
+def test_timeouts_are_passed_to_requests(timeout_client):
+    client = timeout_client
+    document_id = service.create_document_id()
+    file_url = f'https://files.test/{document_id}'
+
+    with requests_mock.Mocker() as m:
+        m.get(f'{client.credentials.api_endpoint}/documents/{document_id}', json={'fileUrl': file_url})
+        m.get(file_url, content=b'foo')
+        client.get_document(document_id)
+        api_request, fileserver_request = m.request_history
+
+    assert api_request.timeout == (1, 2)
+    assert fileserver_request.timeout == (3, 4)
+
+
+def test_deadline_bounds_retries(timeout_client, clock):
+    client = timeout_client
+    workflow_id = service.create_workflow_id()
+    start = clock[0]
+
+    with requests_mock.Mocker() as m:
+        m.get(f'{client.credentials.api_endpoint}/workflows/{workflow_id}', status_code=503)
+        with pytest.raises(RequestException):
+            with client.deadline(0.5):
+                client.get_workflow(workflow_id)
+
+    # Attempts at 0, 0.1 and 0.3 seconds, the next backoff of 0.4 seconds would end past the deadline
+    assert clock[0] - start == pytest.approx(0.3)
+    assert [request.timeout[1] for request in m.request_history] == pytest.approx([0.5, 0.4, 0.2])
+
+
+def test_expired_deadline_fails_fast(timeout_client):
+    client = timeout_client
+
+    with requests_mock.Mocker() as m:
+        with pytest.raises(DeadlineExceeded):
+            with client.deadline(0):
+                client.get_workflow(service.create_workflow_id())
+        assert m.call_count == 0
+
+
+def test_deadline_bounds_waiting_for_rate_limiter(timeout_client, clock):
+    client = timeout_client
+    client.rate_limiter = RateLimiter(10)
+    client.rate_limiter.pause(3)
+    start = clock[0]
+
+    with requests_mock.Mocker() as m:
+        with pytest.raises(DeadlineExceeded):
+            with client.deadline(0.5):
+                client.list_models()
+        assert m.call_count == 0
+    # The limiter gives up at once instead of sleeping until the deadline
+    assert clock[0] == start
+
+
+def test_deadline_bounds_waiting_for_access_token(timeout_client, clock):
+    credentials = timeout_client.credentials
+    credentials._token = NULL_TOKEN
+    credentials._lock = FakeLock()
+
+    with pytest.raises(DeadlineExceeded):
+        with deadline(0.2):
+            credentials.access_token
+    assert credentials._lock.timeouts == [pytest.approx(0.2)]
+
+
+def test_nested_deadlines(clock):
+    assert remaining_time() is None
+    with deadline(10):
+        with deadline(100):
+            assert remaining_time() == 10
+            assert bounded(Timeout(1, None)) == (1, 10)
+        with deadline(1):
+            assert remaining_time() == 1
+    assert remaining_time() is None
@@ -0,0 +1,67 @@
+import time
+
+import pytest
+import requests_mock
+from las import Client
+from las import tracing
+
+from . import service
+
+
+@pytest.fixture(scope='module')
+def exporter():
+    pytest.importorskip('opentelemetry.sdk')
+    from opentelemetry import trace
+    from opentelemetry.sdk.trace import TracerProvider
+    from opentelemetry.sdk.trace.export import SimpleSpanProcessor
+    from opentelemetry.sdk.trace.export.in_memory_span_exporter import InMemorySpanExporter
+
+    exporter = InMemorySpanExporter()
+    provider = TracerProvider()
+    provider.add_span_processor(SimpleSpanProcessor(exporter))
+    trace.set_tracer_provider(provider)
+    return exporter
+
+
+def test_spans_are_nested(exporter, no_backoff_sleep):
+    exporter.clear()
+    client = Client()
+    client.credentials._token = ('', 0)
+    workflow_id = service.create_workflow_id()
+
+    with requests_mock.Mocker() as m:
+        m.post(f'https://{client.credentials.auth_endpoint}/token', json={'access_token': 'token', 'expires_in': 1000})
+        m.get(f'{client.credentials.api_endpoint}/workflows/{workflow_id}', [
+            {'status_code': 503, 'json': {'message': 'Service Unavailable'}},
+            {'json': {'workflowId': workflow_id}},
+        ])
+        client.get_workflow(workflow_id)
+
+    spans = exporter.get_finished_spans()
+    root, = [span for span in spans if span.name == 'Client.get_workflow']
+    assert root.parent is None
+    assert all(span.parent.span_id == root.context.span_id for span in spans if span is not root)
+
+    token, = [span for span in spans if span.name == 'las.token']
+    assert token.attributes['http.response.status_code'] == 200
+
+    attempts = [span for span in spans if span.name == 'GET /workflows/{id}']
+    assert [span.attributes['http.response.status_code'] for span in attempts] == [503, 200]
+    assert attempts[0].attributes['url.template'] == '/workflows/{id}'
+
+    backoff, = [span for span in spans if span.name == 'las.backoff']
+    assert backoff.attributes['las.attempt'] == 1
+    assert backoff.end_time > backoff.start_time
+
+
+def test_tracing_is_noop_without_opentelemetry(monkeypatch):
+    monkeypatch.setattr(tracing, '_tracer', None)
+
+    class Traced:
+        def method(self):
+            return 'result'
+
+    assert tracing.traced_methods(Traced).method is Traced.__dict__['method']
+    with tracing.span('span', attribute=1) as span:
+        span.set_attribute('key', 'value')
+    tracing.record_span('span', time.time(), time.time())
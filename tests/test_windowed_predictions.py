@@ -0,0 +1,80 @@
+import pytest
+import requests_mock
+from las.client import BadRequest
+from las.predictions import merge_predictions, page_windows
+
+from . import service
+
+
+@pytest.mark.parametrize('page_count,window_size,stride,windows', [
+    (1, 3, 0, [[0]]),
+    (7, 3, 0, [[0, 1, 2], [3, 4, 5], [6]]),
+    (5, 3, 2, [[0, 1, 2], [2, 3, 4]]),
+    (4, 2, 1, [[0, 1], [1, 2], [2, 3]]),
+])
+def test_page_windows(page_count, window_size, stride, windows):
+    assert page_windows(page_count, window_size, stride) == windows
+
+
+@pytest.mark.parametrize('window_size,stride', [(4, 0), (0, 0), (2, 3)])
+def test_invalid_page_windows(window_size, stride):
+    with pytest.raises(ValueError):
+        page_windows(10, window_size, stride)
+
+
+def test_merge_keeps_most_confident():
+    windows = [
+        ([0, 1, 2], {'predictionId': 'a', 'predictions': [
+            {'label': 'total', 'value': '10', 'confidence': 0.5, 'page': 0},
+            {'label': 'date', 'value': '2020-01-01', 'confidence': 0.9, 'page': 2},
+        ]}),
+        ([2, 3, 4], {'predictionId': 'b', 'predictions': [
+            {'label': 'total', 'value': '12', 'confidence': 0.8, 'page': 3},
+            {'label': 'date', 'value': '2020-01-01', 'confidence': 0.7, 'page': 2},
+        ]}),
+    ]
+
+    assert merge_predictions(windows) == [
+        {'label': 'total', 'value': '12', 'confidence': 0.8, 'page': 3, 'pages': [2, 3, 4], 'predictionId': 'b'},
+        {'label': 'date', 'value': '2020-01-01', 'confidence': 0.9, 'page': 2, 'pages': [0, 1, 2], 'predictionId': 'a'},
+    ]
+    assert [field['value'] for field in merge_predictions(windows, n=2)] == ['12', '10', '2020-01-01']
+
+
+def test_create_windowed_prediction(make_client):
+    client = make_client()
+    document_id, model_id = service.create_document_id(), service.create_model_id()
+
+    def post_prediction(request, context):
+        body = request.json()
+        pages = body['preprocessConfig']['pages']
+        assert body['preprocessConfig']['imageQuality'] == 'HIGH'
+        assert 'maxPages' not in body['preprocessConfig']
+        predictions = [{'label': 'page', 'value': str(page), 'confidence': page / 10, 'page': page} for page in pages]
+        return {'predictionId': f'prediction-{pages[0]}', 'predictions': predictions}
+
+    with requests_mock.Mocker() as m:
+        m.post(f'{client.credentials.api_endpoint}/predictions', json=post_prediction)
+        prediction = client.create_windowed_prediction(
+            document_id,
+            model_id,
+            page_count=8,
+            preprocess_config={'imageQuality': 'HIGH', 'maxPages': 3},
+            max_concurrency=2,
+        )
+
+    assert m.call_count == 3
+    assert prediction['predictions'] == [
+        {'label': 'page', 'value': '7', 'confidence': 0.7, 'page': 7, 'pages': [6, 7], 'predictionId': 'prediction-6'},
+    ]
+    assert [window['pages'] for window in prediction['windows']] == [[0, 1, 2], [3, 4, 5], [6, 7]]
+    assert all(window['elapsedTime'] <= prediction['elapsedTime'] for window in prediction['windows'])
+
+
+def test_create_windowed_prediction_fails_with_window(make_client):
+    client = make_client()
+
+    with requests_mock.Mocker() as m:
+        m.post(f'{client.credentials.api_endpoint}/predictions', status_code=400, json={'message': 'Invalid page'})
+        with pytest.raises(BadRequest):
+            client.create_windowed_prediction(service.create_document_id(), service.create_model_id(), page_count=5)